@@ -0,0 +1,307 @@
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'src'))
+
+from calculation.function import DERIVATIVE_MODES  # noqa: E402
+from calculation.optimizer import OPTIMIZATION_METHODS, get_optimizer  # noqa: E402
+from core.config import settings  # noqa: E402
+from domain.models import Article, Model  # noqa: E402
+from infrastructure.kernel_store import kernel_store  # noqa: E402
+from infrastructure.repositories import ArticleRepository, ModelRepository  # noqa: E402
+from infrastructure.schema import create_schema  # noqa: E402
+from services.calculation_service import CalculationService  # noqa: E402
+from services.import_service import ImportService  # noqa: E402
+
+DEFAULT_ARTICLES = ROOT / 'articles'
+DEFAULT_MODELS_DB = ROOT / 'db' / 'main_database.db'
+
+
+def load_models(models_db: Path, pattern: str, derivative_mode: Optional[str] = None) -> List[Model]:
+    conn = sqlite3.connect(f'file:{models_db}?mode=ro', uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(
+            'SELECT * FROM models WHERE name LIKE ? ORDER BY id', (pattern,)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    return [
+        Model(
+            name=row['name'],
+            equation=row['equation'],
+            initial_data=json.loads(row['initial_data']) if row['initial_data'] else {},
+            calculated_parameter=row['calculated_parameter'] or '',
+            argument=row['argument'] or '',
+            derivative_mode=derivative_mode or (
+                row['derivative_mode'] if 'derivative_mode' in row.keys() else 'symbolic'
+            ),
+        )
+        for row in rows
+    ]
+
+
+def prepare_database(workdir: Path, articles: Path, models: List[Model]) -> Tuple[List[Tuple[str, int]], List[Model]]:
+    settings.sqlite_path = workdir / 'benchmark.db'
+    kernel_store.directory = workdir / 'kernels'
+    create_schema()
+
+    article_repo = ArticleRepository()
+    model_repo = ModelRepository()
+    import_service = ImportService()
+
+    datasets = []
+    for folder in sorted(p for p in articles.iterdir() if p.is_dir()):
+        article_id = article_repo.create(Article(name=folder.name))
+        files = sorted(folder.glob('*.csv'), key=lambda p: (len(p.stem), p.stem))
+        for path in files:
+            experiment_id = import_service.import_and_save(str(path), article_id)
+            datasets.append((f'{folder.name}/{path.name}', experiment_id))
+
+    stored = []
+    for model in models:
+        model.id = model_repo.create(model)
+        stored.append(model)
+
+    return datasets, stored
+
+
+def run_fit(
+    service: CalculationService,
+    experiment_id: int,
+    model: Model,
+    method_id: int,
+    seed: int,
+    repeat: int,
+    measure_memory: bool
+) -> Dict[str, Any]:
+    func, data, temperature = service.load_problem(experiment_id, model)
+    initial_params = dict.fromkeys(func.parameters, 0.1)
+    func.precompile(list(initial_params))
+
+    timings = []
+    for _ in range(max(repeat, 1)):
+        trace: List[Tuple[int, float]] = []
+        optimizer = get_optimizer(method_id, func, data, temperature)
+        optimizer.callback = lambda info, trace=trace, optimizer=optimizer: trace.append(
+            (optimizer.counts['evaluate'], info.cost)
+        )
+        random.seed(seed)
+        started = time.perf_counter()
+        result = optimizer.run(initial_params, seed=seed)
+        timings.append(time.perf_counter() - started)
+        trace.append((result.summary.evaluate_calls, result.cost))
+
+    peak_memory = None
+    if measure_memory:
+        random.seed(seed)
+        tracemalloc.start()
+        get_optimizer(method_id, func, data, temperature).run(initial_params, seed=seed)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    summary = result.summary
+    return {
+        'method': OPTIMIZATION_METHODS[method_id].__name__,
+        'method_id': method_id,
+        'wall_time': statistics.median(timings),
+        'iterations': summary.iterations,
+        'evaluations': summary.evaluate_calls,
+        'derivative_evaluations': summary.derivative_calls,
+        'second_derivative_evaluations': summary.second_derivative_calls,
+        'stop_reason': summary.stop_reason,
+        'cost': result.cost,
+        'params': result.params,
+        'peak_memory': peak_memory,
+        'trace': trace,
+    }
+
+
+def evaluations_to_tolerance(trace: List[Tuple[int, float]], target: float) -> Optional[int]:
+    for evaluations, cost in trace:
+        if cost <= target:
+            return evaluations
+    return None
+
+
+def run_suite(args: argparse.Namespace) -> Dict[str, Any]:
+    models = load_models(args.models_db, args.models, args.derivative_mode)
+    methods = args.methods if args.methods else sorted(OPTIMIZATION_METHODS)
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        datasets, models = prepare_database(Path(tmp), args.articles, models)
+        service = CalculationService()
+
+        for dataset, experiment_id in datasets:
+            experiment = service.experiment_repo.get_by_id(experiment_id)
+            for model in models:
+                if experiment is None or not service.prepare_data(experiment, model):
+                    results.append({
+                        'dataset': dataset,
+                        'model': model.name,
+                        'status': 'skipped',
+                        'reason': 'no data points',
+                    })
+                    continue
+
+                fits = []
+                for method_id in methods:
+                    try:
+                        fit = run_fit(
+                            service, experiment_id, model, method_id,
+                            args.seed, args.repeat, not args.no_memory
+                        )
+                        fit['status'] = 'ok'
+                    except Exception as e:
+                        fit = {
+                            'method': OPTIMIZATION_METHODS[method_id].__name__,
+                            'method_id': method_id,
+                            'status': f'error: {e}',
+                        }
+                    fit.update(dataset=dataset, model=model.name)
+                    fits.append(fit)
+
+                costs = [fit['cost'] for fit in fits if fit['status'] == 'ok']
+                reference = min(costs) if costs else None
+                for fit in fits:
+                    trace = fit.pop('trace', [])
+                    if reference is not None and fit['status'] == 'ok':
+                        target = reference + args.rtol * max(abs(reference), 1.0)
+                        fit['evaluations_to_tolerance'] = evaluations_to_tolerance(trace, target)
+                results.extend(fits)
+
+                if args.verbose:
+                    for fit in fits:
+                        print(format_row(fit), file=sys.stderr)
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'rtol': args.rtol,
+            'repeat': args.repeat,
+            'derivative_mode': args.derivative_mode,
+        },
+        'results': results,
+    }
+
+
+def result_key(fit: Dict[str, Any]) -> str:
+    return f'{fit["dataset"]}|{fit["model"]}|{fit.get("method", "-")}'
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float,
+    rtol: float,
+    evaluation_threshold: float = 0.0,
+    min_time_delta: float = 0.005
+) -> Tuple[List[str], List[str]]:
+    previous = {result_key(fit): fit for fit in baseline.get('results', [])}
+    regressions = []
+    slowdowns = []
+
+    for fit in current['results']:
+        old = previous.get(result_key(fit))
+        if old is None or old.get('status') != 'ok':
+            continue
+        if fit.get('status') != 'ok':
+            regressions.append(f'{result_key(fit)}: {fit["status"]}')
+            continue
+        for key in ('evaluations', 'derivative_evaluations', 'second_derivative_evaluations'):
+            if key in old and fit[key] > old[key] * (1 + evaluation_threshold):
+                regressions.append(f'{result_key(fit)}: {key.replace("_", " ")} {old[key]} -> {fit[key]}')
+        if fit['cost'] > old['cost'] + rtol * max(abs(old['cost']), 1.0):
+            regressions.append(f'{result_key(fit)}: cost {old["cost"]:.6g} -> {fit["cost"]:.6g}')
+        if (fit['wall_time'] - old['wall_time'] > min_time_delta
+                and fit['wall_time'] > old['wall_time'] * (1 + threshold)):
+            slowdowns.append(
+                f'{result_key(fit)}: wall time {old["wall_time"]:.4f}s -> {fit["wall_time"]:.4f}s'
+            )
+
+    return regressions, slowdowns
+
+
+def format_row(fit: Dict[str, Any]) -> str:
+    if fit.get('status') != 'ok':
+        return f'{fit["dataset"]:<70} {fit["model"]:<12} {fit["method"]:<20} {fit["status"]}'
+    memory = f'{fit["peak_memory"] / 1024:.0f}KiB' if fit.get('peak_memory') is not None else '-'
+    return (
+        f'{fit["dataset"]:<70} {fit["model"]:<12} {fit["method"]:<20} '
+        f'{fit["wall_time"] * 1000:9.2f}ms {fit["evaluations"]:7d} ev '
+        f'{str(fit.get("evaluations_to_tolerance")):>7} ev@tol {fit["cost"]:14.4f} {memory:>8}'
+    )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Fit benchmark over the bundled article datasets')
+    parser.add_argument('--articles', type=Path, default=DEFAULT_ARTICLES)
+    parser.add_argument('--models-db', type=Path, default=DEFAULT_MODELS_DB)
+    parser.add_argument('--models', default='margul%', help='SQL LIKE pattern for model names')
+    parser.add_argument('--derivative-mode', choices=DERIVATIVE_MODES, help='override the models\' setting')
+    parser.add_argument('--methods', type=int, nargs='*', help='method ids, all by default')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5, help='runs per fit, the median time is reported')
+    parser.add_argument('--rtol', type=float, default=1e-6)
+    parser.add_argument('--no-memory', action='store_true')
+    parser.add_argument('--json', type=Path, help='write results to this file')
+    parser.add_argument('--baseline', type=Path, help='compare against a saved JSON result')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed relative wall time growth')
+    parser.add_argument(
+        '--min-time-delta', type=float, default=0.005,
+        help='wall time growth in seconds below which timing changes are ignored'
+    )
+    parser.add_argument('--fail-on-time', action='store_true', help='treat wall time growth as a regression')
+    parser.add_argument(
+        '--evaluation-threshold', type=float, default=0.0,
+        help='allowed relative growth of function and derivative evaluation counts'
+    )
+    parser.add_argument('--verbose', action='store_true')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    report = run_suite(args)
+
+    skipped = [fit for fit in report['results'] if fit['status'] == 'skipped']
+    for fit in report['results']:
+        if fit['status'] != 'skipped':
+            print(format_row(fit))
+    if skipped:
+        print(f'skipped {len(skipped)} model/dataset pairs without data points')
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding='utf-8')
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        regressions, slowdowns = compare(
+            report, baseline, args.threshold, args.rtol, args.evaluation_threshold, args.min_time_delta
+        )
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        for line in slowdowns:
+            print(f'SLOWER {line}')
+        return 1 if regressions or (args.fail_on_time and slowdowns) else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
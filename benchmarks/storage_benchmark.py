@@ -0,0 +1,113 @@
+import argparse
+import json
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'src'))
+
+from core.config import settings  # noqa: E402
+from infrastructure import columnar  # noqa: E402
+from infrastructure.database import db_connection  # noqa: E402
+from infrastructure.repositories import ExperimentRepository  # noqa: E402
+from infrastructure.schema import migrate  # noqa: E402
+
+DEFAULT_DB = ROOT / 'db' / 'main_database.db'
+
+
+def best_time(func: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def decode_json(rows: List[str]) -> List[Dict[str, np.ndarray]]:
+    return [
+        {key: np.asarray(values, dtype=np.float64) for key, values in json.loads(row).items()}
+        for row in rows
+    ]
+
+
+def encode_json(blob: bytes) -> str:
+    return json.dumps({key: values.tolist() for key, values in columnar.decode(blob).items()})
+
+
+def run_suite(args: argparse.Namespace) -> Dict[str, Any]:
+    workdir = Path(tempfile.mkdtemp(prefix='storage-benchmark-'))
+    try:
+        settings.sqlite_path = workdir / 'benchmark.db'
+        shutil.copyfile(args.database, settings.sqlite_path)
+        migrate()
+        db_connection.close_all()
+
+        conn = sqlite3.connect(str(settings.sqlite_path))
+        rows = conn.execute(
+            'SELECT id, source_data, source_blob FROM experiments WHERE source_blob IS NOT NULL'
+        ).fetchall()
+        blobs = [bytes(row[2]) for row in rows]
+        texts = [row[1] if row[1] is not None else encode_json(blob) for row, blob in zip(rows, blobs)]
+
+        repo = ExperimentRepository()
+        columnar_load = best_time(repo.get_all, args.repeat)
+        conn.executemany(
+            'UPDATE experiments SET source_data = ?, source_blob = NULL WHERE id = ?',
+            [(text, row[0]) for text, row in zip(texts, rows)],
+        )
+        conn.commit()
+        conn.close()
+        json_load = best_time(repo.get_all, args.repeat)
+        db_connection.close_all()
+
+        return {
+            'experiments': len(rows),
+            'points': sum(len(values) for row in texts for values in json.loads(row).values()),
+            'json_bytes': sum(len(text.encode('utf-8')) for text in texts),
+            'columnar_bytes': sum(len(blob) for blob in blobs),
+            'json_decode': best_time(lambda: decode_json(texts), args.repeat),
+            'columnar_decode': best_time(lambda: [columnar.decode(blob) for blob in blobs], args.repeat),
+            'json_get_all': json_load,
+            'columnar_get_all': columnar_load,
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Compare JSON and columnar storage of experiment data')
+    parser.add_argument('--database', type=Path, default=DEFAULT_DB)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', type=Path)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    report = run_suite(args)
+
+    print(f"experiments: {report['experiments']}, points: {report['points']}")
+    print(f"{'':12} {'json':>12} {'columnar':>12} {'ratio':>8}")
+    for label, key in (('size, B', 'bytes'), ('decode, ms', 'decode'), ('get_all, ms', 'get_all')):
+        json_value, columnar_value = report[f'json_{key}'], report[f'columnar_{key}']
+        scale = 1 if key == 'bytes' else 1000
+        print(
+            f'{label:12} {json_value * scale:12.3f} {columnar_value * scale:12.3f} '
+            f'{json_value / columnar_value:8.2f}'
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import sympy as sp
+
+
+class Dual:
+    __slots__ = ('value', 'grad', 'hess')
+
+    def __init__(self, value: Any, grad: Optional[np.ndarray], hess: Optional[np.ndarray] = None):
+        self.value = value
+        self.grad = grad
+        self.hess = hess
+
+    @classmethod
+    def variable(cls, value: Any, index: int, size: int, ndim: int, order: int) -> 'Dual':
+        tail = (1,) * ndim
+        grad = np.zeros((size,) + tail)
+        grad[index] = 1.0
+        hess = np.zeros((size, size) + tail) if order > 1 else None
+        return cls(value, grad, hess)
+
+    def __add__(self, other: 'Dual') -> 'Dual':
+        value = self.value + other.value
+        if other.grad is None:
+            return Dual(value, self.grad, self.hess)
+        if self.grad is None:
+            return Dual(value, other.grad, other.hess)
+        hess = None
+        if self.hess is not None and other.hess is not None:
+            hess = self.hess + other.hess
+        return Dual(value, self.grad + other.grad, hess)
+
+    def __mul__(self, other: 'Dual') -> 'Dual':
+        a, b = self.value, other.value
+        if self.grad is None and other.grad is None:
+            return Dual(a * b, None)
+        if self.grad is None:
+            return Dual(a * b, a * other.grad, None if other.hess is None else a * other.hess)
+        if other.grad is None:
+            return Dual(a * b, b * self.grad, None if self.hess is None else b * self.hess)
+
+        hess = None
+        if self.hess is not None and other.hess is not None:
+            cross = _outer(self.grad, other.grad)
+            hess = a * other.hess + b * self.hess + cross + np.swapaxes(cross, 0, 1)
+        return Dual(a * b, a * other.grad + b * self.grad, hess)
+
+    def apply(self, value: Any, first: Any, second: Any = None) -> 'Dual':
+        if self.grad is None:
+            return Dual(value, None)
+        hess = None
+        if self.hess is not None:
+            hess = first * self.hess + second * _outer(self.grad, self.grad)
+        return Dual(value, first * self.grad, hess)
+
+    def power(self, exponent: float) -> 'Dual':
+        v = self.value
+        if self.grad is None:
+            return Dual(v ** exponent, None)
+        if exponent == 2:
+            return self.apply(v * v, 2 * v, 2.0)
+        if exponent == 1:
+            return self
+        return self.apply(
+            v ** exponent,
+            exponent * v ** (exponent - 1),
+            exponent * (exponent - 1) * v ** (exponent - 2),
+        )
+
+
+UNARY_RULES: Dict[type, Callable[[Any], Tuple[Any, Any, Any]]] = {
+    sp.exp: lambda v: (np.exp(v), np.exp(v), np.exp(v)),
+    sp.log: lambda v: (np.log(v), 1 / v, -1 / v ** 2),
+    sp.sin: lambda v: (np.sin(v), np.cos(v), -np.sin(v)),
+    sp.cos: lambda v: (np.cos(v), -np.sin(v), -np.cos(v)),
+    sp.tan: lambda v: (np.tan(v), 1 / np.cos(v) ** 2, 2 * np.tan(v) / np.cos(v) ** 2),
+    sp.sinh: lambda v: (np.sinh(v), np.cosh(v), np.sinh(v)),
+    sp.cosh: lambda v: (np.cosh(v), np.sinh(v), np.cosh(v)),
+    sp.tanh: lambda v: (np.tanh(v), 1 - np.tanh(v) ** 2, -2 * np.tanh(v) * (1 - np.tanh(v) ** 2)),
+    sp.atan: lambda v: (np.arctan(v), 1 / (1 + v ** 2), -2 * v / (1 + v ** 2) ** 2),
+}
+
+
+def evaluate(
+    expression: sp.Expr,
+    variables: Sequence[str],
+    params: Dict[str, Any],
+    order: int = 1
+) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    size = len(variables)
+    seeds = {name: i for i, name in enumerate(variables)}
+    shape = np.broadcast_shapes(*[np.shape(value) for value in params.values()])
+    ndim = len(shape)
+    memo: Dict[sp.Basic, Dual] = {}
+
+    def walk(node: sp.Basic) -> Dual:
+        dual = memo.get(node)
+        if dual is not None:
+            return dual
+
+        if node.is_Symbol:
+            name = str(node)
+            value = np.asarray(params[name], dtype=np.float64)
+            value = value.reshape((1,) * (ndim - value.ndim) + value.shape)
+            if name in seeds:
+                dual = Dual.variable(value, seeds[name], size, ndim, order)
+            else:
+                dual = Dual(value, None)
+        elif node.is_Number or node.is_NumberSymbol:
+            dual = Dual(float(node), None)
+        elif node.is_Add:
+            args = [walk(arg) for arg in node.args]
+            dual = args[0]
+            for arg in args[1:]:
+                dual = dual + arg
+        elif node.is_Mul:
+            args = [walk(arg) for arg in node.args]
+            dual = args[0]
+            for arg in args[1:]:
+                dual = dual * arg
+        elif node.is_Pow:
+            base, exponent = node.args
+            if exponent.is_Number:
+                dual = walk(base).power(float(exponent))
+            else:
+                log_base = walk(sp.log(base, evaluate=False))
+                dual = _unary(sp.exp, walk(exponent) * log_base)
+        elif type(node) in UNARY_RULES:
+            dual = _unary(type(node), walk(node.args[0]))
+        else:
+            raise ValueError(f'Unsupported operation for autodiff: {type(node).__name__}')
+
+        memo[node] = dual
+        return dual
+
+    result = walk(expression)
+    value = np.broadcast_to(np.asarray(result.value, dtype=np.float64), shape)
+    if result.grad is None:
+        result = Dual(value, np.zeros((size,) + shape), np.zeros((size, size) + shape))
+
+    grad = np.broadcast_to(np.asarray(result.grad), (size,) + shape)
+    hess = None
+    if order > 1:
+        hess = np.broadcast_to(np.asarray(result.hess), (size, size) + shape)
+    return value, grad, hess
+
+
+def _unary(func: type, dual: Dual) -> Dual:
+    value, first, second = UNARY_RULES[func](dual.value)
+    return dual.apply(value, first, second)
+
+
+def _outer(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.asarray(a[:, np.newaxis] * b[np.newaxis, :])
@@ -0,0 +1,24 @@
+import threading
+
+STOP_COMPLETED = 'completed'
+STOP_DEADLINE = 'deadline'
+STOP_MAX_EVALUATIONS = 'max_evaluations'
+STOP_CANCELLED = 'cancelled'
+
+
+class CancellationToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class BudgetExceeded(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
@@ -0,0 +1,89 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from calculation.function import MathFunction
+
+
+class ExpressionCache:
+    def __init__(self, max_size: int = 128):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Tuple[str, ...], MathFunction] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        expression: str,
+        calculated_param: str,
+        argument: str,
+        backend: str,
+        derivative_mode: str = 'symbolic'
+    ) -> Tuple[str, ...]:
+        return (''.join(expression.split()), calculated_param, argument, backend, derivative_mode)
+
+    def get_function(
+        self,
+        expression: str,
+        calculated_param: str,
+        argument: str,
+        backend: str = 'numpy',
+        derivative_mode: str = 'symbolic',
+        on_create: Optional[Callable[[MathFunction], None]] = None
+    ) -> MathFunction:
+        key = self.make_key(expression, calculated_param, argument, backend, derivative_mode)
+
+        with self._lock:
+            func = self._entries.get(key)
+            if func is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return func
+            self.misses += 1
+
+        func = MathFunction(
+            expression, calculated_param, argument,
+            backend=backend, derivative_mode=derivative_mode
+        )
+        if on_create is not None:
+            on_create(func)
+
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                self._entries.move_to_end(key)
+                return existing
+            self._entries[key] = func
+            self._evict()
+
+        return func
+
+    def resize(self, max_size: int) -> None:
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self) -> None:
+        while len(self._entries) > max(self.max_size, 0):
+            self._entries.popitem(last=False)
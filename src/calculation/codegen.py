@@ -0,0 +1,29 @@
+from typing import Any, Callable, Dict, Sequence
+
+import numpy
+import sympy as sp
+from sympy.printing.numpy import NumPyPrinter
+
+
+def generate_kernel(name: str, arguments: Sequence[str], expression: sp.Expr) -> str:
+    printer = NumPyPrinter()
+    body = printer.doprint(expression)
+    return f'def {name}({", ".join(arguments)}):\n    return {body}\n'
+
+
+def generate_fused_kernel(name: str, arguments: Sequence[str], expressions: Sequence[sp.Expr]) -> str:
+    printer = NumPyPrinter()
+    replacements, reduced = sp.cse(list(expressions), symbols=sp.numbered_symbols('_cse'))
+    lines = [f'def {name}({", ".join(arguments)}):']
+    for symbol, expr in replacements:
+        lines.append(f'    {symbol} = {printer.doprint(expr)}')
+    outputs = ', '.join(printer.doprint(expr) for expr in reduced)
+    lines.append(f'    return ({outputs},)')
+    return '\n'.join(lines) + '\n'
+
+
+def compile_kernel(name: str, source: str) -> Callable:
+    namespace: Dict[str, Any] = {'numpy': numpy}
+    exec(compile(source, f'<kernel {name}>', 'exec'), namespace)
+    kernel: Callable = namespace[name]
+    return kernel
@@ -0,0 +1,45 @@
+from typing import Callable, Tuple
+
+import numpy as np
+
+
+def adaptive_curve(
+    func: Callable[[np.ndarray], np.ndarray],
+    start: float,
+    end: float,
+    budget: int = 400,
+    initial: int = 33,
+    tolerance: float = 1e-3
+) -> Tuple[np.ndarray, np.ndarray]:
+    x = np.linspace(start, end, max(min(initial, budget), 3))
+    y = np.asarray(func(x), dtype=np.float64)
+
+    while len(x) < budget:
+        finite = y[np.isfinite(y)]
+        scale = float(np.ptp(finite)) if finite.size else 0.0
+        if scale == 0:
+            break
+
+        left, middle, right = slice(None, -2), slice(1, -1), slice(2, None)
+        weight = (x[middle] - x[left]) / (x[right] - x[left])
+        chord = y[left] + weight * (y[right] - y[left])
+        error = np.abs(y[middle] - chord) / scale
+        error[~np.isfinite(error)] = np.inf
+
+        interval_error = np.zeros(len(x) - 1)
+        interval_error[:-1] = error
+        interval_error[1:] = np.maximum(interval_error[1:], error)
+
+        refine = np.flatnonzero(interval_error > tolerance)
+        if refine.size == 0:
+            break
+        if refine.size > budget - len(x):
+            refine = refine[np.argsort(interval_error[refine])[::-1][:budget - len(x)]]
+
+        new_x = (x[refine] + x[refine + 1]) / 2
+        new_y = np.asarray(func(new_x), dtype=np.float64)
+        order = np.argsort(np.concatenate([x, new_x]), kind='stable')
+        x = np.concatenate([x, new_x])[order]
+        y = np.concatenate([y, new_y])[order]
+
+    return x, y
@@ -1,44 +1,249 @@
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Sequence, Tuple
 
+import numpy as np
 import sympy as sp
 
+from calculation import autodiff
+from calculation.codegen import compile_kernel, generate_fused_kernel, generate_kernel
+
+BACKENDS = ('numpy', 'sympy')
+
+DERIVATIVE_MODES = ('symbolic', 'autodiff')
+
 
 class MathFunction:
-    def __init__(self, expression: str, calculated_param: str, argument: str):
+    def __init__(
+        self,
+        expression: str,
+        calculated_param: str,
+        argument: str,
+        backend: str = 'numpy',
+        derivative_mode: str = 'symbolic'
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f'Unsupported backend: {backend}')
+        if derivative_mode not in DERIVATIVE_MODES:
+            raise ValueError(f'Unsupported derivative mode: {derivative_mode}')
+
         self.expression = expression
         self.calculated_param = calculated_param
         self.argument = argument
+        self.backend = backend
+        self.derivative_mode = derivative_mode
         self.symbolic_expr = sp.sympify(expression)
+        self.variables: List[str] = sorted(str(s) for s in self.symbolic_expr.free_symbols)
         self._derivatives_cache: Dict[str, Any] = {}
         self._second_derivatives_cache: Dict[tuple, Any] = {}
+        self._kernels: Dict[Any, Callable] = {}
+        self._sources: Dict[Any, str] = {}
+        self._unsaved_kernels = False
 
     def evaluate(self, params: Dict[str, float]) -> float:
-        value = self.symbolic_expr.subs(params)
-        return float(value.evalf())
+        return self._evaluate_point('value', params)
 
     def derivative(self, variable: str, params: Dict[str, float]) -> float:
+        return self._evaluate_point(('d', variable), params)
+
+    def second_derivative(self, var1: str, var2: str, params: Dict[str, float]) -> float:
+        return self._evaluate_point(('d2', var1, var2), params)
+
+    def evaluate_array(self, params: Dict[str, Any]) -> np.ndarray:
+        return self._evaluate_array('value', params)
+
+    def derivative_array(self, variable: str, params: Dict[str, Any]) -> np.ndarray:
+        return self._evaluate_array(('d', variable), params)
+
+    def second_derivative_array(self, var1: str, var2: str, params: Dict[str, Any]) -> np.ndarray:
+        return self._evaluate_array(('d2', var1, var2), params)
+
+    def value_and_gradient(
+        self,
+        variables: Sequence[str],
+        params: Dict[str, Any]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        value, gradient, _ = self._evaluate_fused(tuple(variables), params, order=1)
+        return value, gradient
+
+    def value_gradient_hessian(
+        self,
+        variables: Sequence[str],
+        params: Dict[str, Any]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self._evaluate_fused(tuple(variables), params, order=2)
+
+    @property
+    def parameters(self) -> List[str]:
+        return [name for name in self.variables if name not in ('x', 'temp')]
+
+    @property
+    def has_unsaved_kernels(self) -> bool:
+        return self._unsaved_kernels
+
+    def precompile(self, variables: Sequence[str]) -> None:
+        variables = tuple(variables)
+        self._kernel('value')
+        if self.derivative_mode == 'autodiff':
+            return
+        for variable in variables:
+            self._kernel(('d', variable))
+        self._kernel(('fused', 1, variables))
+        self._kernel(('fused', 2, variables))
+
+    def export_kernels(self) -> Dict[str, Any]:
+        self._unsaved_kernels = False
+        return {
+            'variables': self.variables,
+            'kernels': [[key, source] for key, source in self._sources.items()],
+        }
+
+    def load_kernels(self, payload: Dict[str, Any]) -> None:
+        if payload.get('variables') != self.variables:
+            return
+
+        for key, source in payload.get('kernels', []):
+            key = self._decode_key(key)
+            if key not in self._kernels:
+                self._kernels[key] = compile_kernel('kernel', source)
+                self._sources[key] = source
+
+    def _derivative_expr(self, variable: str) -> Any:
         if variable not in self._derivatives_cache:
             var = sp.symbols(variable)
             self._derivatives_cache[variable] = sp.diff(self.symbolic_expr, var)
-        
-        deriv_expr = self._derivatives_cache[variable]
-        value = deriv_expr.subs(params)
-        return float(value.evalf())
+        return self._derivatives_cache[variable]
 
-    def second_derivative(self, var1: str, var2: str, params: Dict[str, float]) -> float:
+    def _second_derivative_expr(self, var1: str, var2: str) -> Any:
         key = (var1, var2)
-        
+
         if key not in self._second_derivatives_cache:
-            if var1 not in self._derivatives_cache:
-                symbol1 = sp.symbols(var1)
-                self._derivatives_cache[var1] = sp.diff(self.symbolic_expr, symbol1)
-            
             symbol2 = sp.symbols(var2)
             self._second_derivatives_cache[key] = sp.diff(
-                self._derivatives_cache[var1], 
+                self._derivative_expr(var1),
                 symbol2
             )
-        
-        second_deriv_expr = self._second_derivatives_cache[key]
-        value = second_deriv_expr.subs(params)
-        return float(value.evalf())
\ No newline at end of file
+
+        return self._second_derivatives_cache[key]
+
+    def _expression(self, key: Any) -> Any:
+        if key == 'value':
+            return self.symbolic_expr
+        if key[0] == 'd':
+            return self._derivative_expr(key[1])
+        if key[0] == 'd2':
+            return self._second_derivative_expr(key[1], key[2])
+
+        _, order, variables = key
+        expressions = [self.symbolic_expr]
+        expressions += [self._derivative_expr(v) for v in variables]
+        if order > 1:
+            expressions += [
+                self._second_derivative_expr(var1, var2)
+                for var1, var2 in self._upper_pairs(variables)
+            ]
+        return expressions
+
+    def _kernel(self, key: Any) -> Callable:
+        kernel = self._kernels.get(key)
+        if kernel is None:
+            expr = self._expression(key)
+            if isinstance(expr, list):
+                source = generate_fused_kernel('kernel', self.variables, expr)
+            else:
+                source = generate_kernel('kernel', self.variables, expr)
+            kernel = compile_kernel('kernel', source)
+            self._kernels[key] = kernel
+            self._sources[key] = source
+            self._unsaved_kernels = True
+        return kernel
+
+    @staticmethod
+    def _decode_key(key: Any) -> Any:
+        if isinstance(key, str):
+            return key
+        return tuple(tuple(part) if isinstance(part, list) else part for part in key)
+
+    @staticmethod
+    def _upper_pairs(variables: Tuple[str, ...]) -> List[Tuple[str, str]]:
+        return [
+            (variables[i], variables[j])
+            for i in range(len(variables))
+            for j in range(i, len(variables))
+        ]
+
+    def _call(self, key: Any, params: Dict[str, Any]) -> Any:
+        kernel = self._kernel(key)
+        return kernel(*[params[name] for name in self.variables])
+
+    def _autodiff(self, key: Any, params: Dict[str, Any]) -> Any:
+        if key[0] == 'd':
+            _, gradient, _ = autodiff.evaluate(self.symbolic_expr, key[1:], params, order=1)
+            return gradient[0]
+
+        variables = tuple(dict.fromkeys(key[1:]))
+        _, _, hessian = autodiff.evaluate(self.symbolic_expr, variables, params, order=2)
+        if hessian is None:
+            raise ValueError(f'Second derivative is not available for {key}')
+        return hessian[0, -1]
+
+    def _evaluate_point(self, key: Any, params: Dict[str, float]) -> float:
+        if key != 'value' and self.derivative_mode == 'autodiff':
+            return float(self._autodiff(key, params))
+        if self.backend == 'sympy':
+            value = self._expression(key).subs(params)
+            return float(value.evalf())
+        return float(self._call(key, params))
+
+    def _evaluate_array(self, key: Any, params: Dict[str, Any]) -> np.ndarray:
+        shape = np.broadcast_shapes(*[np.shape(params[name]) for name in self.variables])
+
+        if key != 'value' and self.derivative_mode == 'autodiff':
+            params = {name: params[name] for name in self.variables}
+            return np.broadcast_to(self._autodiff(key, params), shape)
+
+        if self.backend == 'sympy':
+            expr = self._expression(key)
+            values = np.empty(shape)
+            arrays = {name: np.broadcast_to(params[name], shape) for name in self.variables}
+            for index in np.ndindex(shape):
+                point = {name: float(array[index]) for name, array in arrays.items()}
+                values[index] = float(expr.subs(point).evalf())
+            return values
+
+        values = self._call(key, params)
+        return np.broadcast_to(np.asarray(values, dtype=np.float64), shape)
+
+    def _evaluate_fused(
+        self,
+        variables: Tuple[str, ...],
+        params: Dict[str, Any],
+        order: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        shape = np.broadcast_shapes(*[np.shape(params[name]) for name in self.variables])
+        if self.derivative_mode == 'autodiff':
+            params = {name: params[name] for name in self.variables}
+            value, gradient, hessian = autodiff.evaluate(self.symbolic_expr, variables, params, order)
+            if hessian is None:
+                hessian = np.empty((len(variables), len(variables)) + shape)
+            return value, gradient, hessian
+
+        pairs = self._upper_pairs(variables) if order > 1 else []
+
+        if self.backend == 'sympy':
+            outputs = [self.evaluate_array(params)]
+            outputs += [self.derivative_array(v, params) for v in variables]
+            outputs += [self.second_derivative_array(v1, v2, params) for v1, v2 in pairs]
+        else:
+            outputs = self._call(('fused', order, variables), params)
+
+        size = len(variables)
+        value = np.broadcast_to(np.asarray(outputs[0], dtype=np.float64), shape)
+        gradient = np.empty((size,) + shape)
+        for i in range(size):
+            gradient[i] = outputs[1 + i]
+
+        hessian = np.empty((size, size) + shape)
+        for k, (var1, var2) in enumerate(pairs):
+            i, j = variables.index(var1), variables.index(var2)
+            hessian[i, j] = hessian[j, i] = outputs[1 + size + k]
+
+        return value, gradient, hessian
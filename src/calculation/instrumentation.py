@@ -0,0 +1,65 @@
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+@dataclass
+class IterationInfo:
+    iteration: int
+    params: Dict[str, float]
+    cost: float
+
+
+@dataclass
+class FitSummary:
+    method: str
+    iterations: int = 0
+    evaluate_calls: int = 0
+    derivative_calls: int = 0
+    second_derivative_calls: int = 0
+    memo_hits: int = 0
+    wall_time: float = 0.0
+    phase_times: Dict[str, float] = field(default_factory=dict)
+    stop_reason: str = 'completed'
+    cached: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'method': self.method,
+            'iterations': self.iterations,
+            'evaluate_calls': self.evaluate_calls,
+            'derivative_calls': self.derivative_calls,
+            'second_derivative_calls': self.second_derivative_calls,
+            'memo_hits': self.memo_hits,
+            'wall_time': self.wall_time,
+            'phase_times': dict(self.phase_times),
+            'stop_reason': self.stop_reason,
+            'cached': self.cached,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FitSummary':
+        names = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in names})
+
+
+class OptimizationResult(Tuple[Dict[str, float], float]):
+    summary: Optional[FitSummary]
+
+    def __new__(cls, params: Dict[str, float], cost: float, summary: Optional[FitSummary] = None):
+        result = super().__new__(cls, (params, cost))
+        result.summary = summary
+        return result
+
+    def __getnewargs__(self):
+        return self[0], self[1], self.summary
+
+    @property
+    def params(self) -> Dict[str, float]:
+        return self[0]
+
+    @property
+    def cost(self) -> float:
+        return self[1]
+
+
+IterationCallback = Callable[[IterationInfo], Any]
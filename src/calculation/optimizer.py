@@ -1,46 +1,382 @@
 import math
 import random
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from calculation.budget import (
+    STOP_CANCELLED,
+    STOP_COMPLETED,
+    STOP_DEADLINE,
+    STOP_MAX_EVALUATIONS,
+    BudgetExceeded,
+    CancellationToken,
+)
+from calculation.function import MathFunction
+from calculation.instrumentation import (
+    FitSummary,
+    IterationCallback,
+    IterationInfo,
+    OptimizationResult,
+)
+
+PHASE_KINDS = {
+    'evaluate': ('evaluate',),
+    'derivative': ('derivative',),
+    'second_derivative': ('second_derivative',),
+    'gradient': ('evaluate', 'derivative'),
+    'hessian': ('evaluate', 'derivative', 'second_derivative'),
+}
 
-import sympy
 
-from calculation.function import MathFunction
+def _partial_count(kind: str, size: int) -> int:
+    # Counters are per parameter point: one model value, one per first partial
+    # derivative and one per distinct second partial, fused or not.
+    if kind == 'derivative':
+        return size
+    if kind == 'second_derivative':
+        return size * (size + 1) // 2
+    return 1
 
 
 class OptimizationMethod(ABC):
-    def __init__(self, func: MathFunction, data: List[Tuple[float, float]], temperature: float):
+    memo_size = 0
+    memo_digits = 12
+
+    def __init__(
+        self,
+        func: MathFunction,
+        data: List[Tuple[float, float]],
+        temperature: float,
+        memo_size: Optional[int] = None,
+        callback: Optional[IterationCallback] = None,
+        profile: bool = False
+    ):
         self.func = func
         self.data = data
         self.temperature = temperature
+        self.x = np.ascontiguousarray([x for x, _ in data], dtype=np.float64)
+        self.y = np.ascontiguousarray([y for _, y in data], dtype=np.float64)
+
+        if memo_size is not None:
+            self.memo_size = memo_size
+        self._memo: OrderedDict[tuple, float] = OrderedDict()
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+        self.callback = callback
+        self.profile = profile or callback is not None
+        self.iterations = 0
+        self.counts = {'evaluate': 0, 'derivative': 0, 'second_derivative': 0}
+        self.phase_times: Dict[str, float] = {}
+
+        self.deadline: Optional[float] = None
+        self.max_evaluations: Optional[int] = None
+        self.cancel_token: Optional[CancellationToken] = None
+        self._budgeted = False
+        self._best: Optional[Tuple[Dict[str, float], float]] = None
+        self.bounds: Dict[str, Tuple[float, float]] = {}
+
+    @classmethod
+    def is_deterministic(cls, options: Dict[str, Any]) -> bool:
+        return True
+
+    def run(
+        self,
+        initial_params: Dict[str, float],
+        bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+        time_limit: Optional[float] = None,
+        max_evaluations: Optional[int] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        **kwargs
+    ) -> OptimizationResult:
+        self.iterations = 0
+        self.counts = dict.fromkeys(self.counts, 0)
+        self.phase_times = {}
+        memo_hits = self.memo_hits
+        self.bounds = dict(bounds or {})
+        initial_params = self.project(initial_params)
+
+        started = time.perf_counter()
+        self.deadline = started + time_limit if time_limit else None
+        self.max_evaluations = max_evaluations or None
+        self.cancel_token = cancel_token
+        self._budgeted = bool(self.deadline or self.max_evaluations or cancel_token)
+        self._best = None
+        stop_reason = STOP_COMPLETED
+
+        try:
+            params, cost = self.optimize(initial_params, **kwargs)
+        except BudgetExceeded as e:
+            stop_reason = e.reason
+            params, cost = self._best_so_far(initial_params)
+        finally:
+            self._budgeted = False
+
+        summary = FitSummary(
+            method=type(self).__name__,
+            iterations=self.iterations,
+            evaluate_calls=self.counts['evaluate'],
+            derivative_calls=self.counts['derivative'],
+            second_derivative_calls=self.counts['second_derivative'],
+            memo_hits=self.memo_hits - memo_hits,
+            wall_time=time.perf_counter() - started,
+            phase_times=dict(self.phase_times),
+            stop_reason=stop_reason,
+        )
+        return OptimizationResult(params, cost, summary)
 
     def objective(self, params: Dict[str, float], x: float, target: float) -> float:
         eval_params = {**params, 'x': x, 'temp': self.temperature}
-        predicted = self.func.evaluate(eval_params)
+        predicted: float = self._call_func('evaluate', 1, self.func.evaluate, eval_params)
         return (target - predicted) ** 2
 
+    def residuals(self, params: Dict[str, float]) -> np.ndarray:
+        predicted = self._call_func('evaluate', 1, self.func.evaluate_array, self._point_params(params))
+        residuals: np.ndarray = self.y - predicted
+        return residuals
+
     def objective_sum(self, params: Dict[str, float]) -> float:
-        return sum(self.objective(params, x, y) for x, y in self.data)
+        if not self.memo_size:
+            residuals = self.residuals(params)
+            return float(residuals @ residuals)
+
+        key = tuple((k, f'{v:.{self.memo_digits}g}') for k, v in params.items())
+        cost = self._memo.get(key)
+        if cost is not None:
+            self._memo.move_to_end(key)
+            self.memo_hits += 1
+            return cost
+
+        self.memo_misses += 1
+        residuals = self.residuals(params)
+        cost = float(residuals @ residuals)
+        self._memo[key] = cost
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+        return cost
+
+    def memo_stats(self) -> Dict[str, float]:
+        total = self.memo_hits + self.memo_misses
+        return {
+            'size': len(self._memo),
+            'max_size': self.memo_size,
+            'hits': self.memo_hits,
+            'misses': self.memo_misses,
+            'hit_rate': self.memo_hits / total if total else 0.0,
+        }
+
+    def gradient(self, params: Dict[str, float]) -> np.ndarray:
+        residuals, jacobian = self.residuals_and_jacobian(params)
+        gradient: np.ndarray = -2 * jacobian @ residuals
+        return gradient
+
+    def residuals_and_jacobian(self, params: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+        predicted, jacobian = self._call_func(
+            'gradient', 1, self.func.value_and_gradient,
+            list(params), self._point_params(params), size=len(params)
+        )
+        residuals = np.broadcast_to(self.y - predicted, self.y.shape)
+        return residuals, self._per_point(jacobian, len(params))
+
+    def hessian(self, params: Dict[str, float]) -> np.ndarray:
+        return self.objective_terms(params)[2]
+
+    def objective_terms(self, params: Dict[str, float]) -> Tuple[float, np.ndarray, np.ndarray]:
+        size = len(params)
+        predicted, jacobian, second_derivs = self._call_func(
+            'hessian', 1, self.func.value_gradient_hessian,
+            list(params), self._point_params(params), size=size
+        )
+        residuals = self.y - predicted
+        jacobian = self._per_point(jacobian, size)
+        second_derivs = self._per_point(second_derivs, size, size)
+
+        cost = float(residuals @ residuals)
+        gradient = -2 * jacobian @ residuals
+        hessian = 2 * jacobian @ jacobian.T - 2 * second_derivs @ residuals
+        return cost, gradient, hessian
 
     def gradient_component(self, params: Dict[str, float], variable: str) -> float:
-        total = 0.0
-        for x, target in self.data:
-            eval_params = {**params, 'x': x, 'temp': self.temperature}
-            predicted = self.func.evaluate(eval_params)
-            deriv = self.func.derivative(variable, eval_params)
-            total += 2 * deriv * (target - predicted)
-        return total
+        deriv = self._call_func(
+            'derivative', 1, self.func.derivative_array, variable, self._point_params(params)
+        )
+        return float(-2 * np.sum(deriv * self.residuals(params)))
 
     def hessian_component(self, params: Dict[str, float], var1: str, var2: str) -> float:
-        total = 0.0
-        for x, target in self.data:
-            eval_params = {**params, 'x': x, 'temp': self.temperature}
-            predicted = self.func.evaluate(eval_params)
-            second_deriv = self.func.second_derivative(var1, var2, eval_params)
-            deriv1 = self.func.derivative(var1, eval_params)
-            deriv2 = self.func.derivative(var2, eval_params)
-            total += 2 * second_deriv * (target - predicted) - 2 * deriv1 * deriv2
-        return total
+        point = self._point_params(params)
+        residuals = self.residuals(params)
+        second_deriv = self._call_func(
+            'second_derivative', 1, self.func.second_derivative_array, var1, var2, point
+        )
+        deriv1 = self._call_func('derivative', 1, self.func.derivative_array, var1, point)
+        deriv2 = self._call_func('derivative', 1, self.func.derivative_array, var2, point)
+        return float(np.sum(2 * deriv1 * deriv2 - 2 * second_deriv * residuals))
+
+    def objective_batch(self, keys: Sequence[str], points: np.ndarray) -> np.ndarray:
+        predicted = self._call_func(
+            'evaluate', len(points), self.func.evaluate_array, self._batch_params(keys, points)
+        )
+        residuals = np.broadcast_to(self.y - predicted, (len(points), self.y.size))
+        costs: np.ndarray = np.sum(residuals * residuals, axis=-1)
+        return costs
+
+    def gradient_batch(self, keys: Sequence[str], points: np.ndarray) -> np.ndarray:
+        size, count = len(keys), len(points)
+        predicted, jacobian = self._call_func(
+            'gradient', count, self.func.value_and_gradient,
+            keys, self._batch_params(keys, points), size=size
+        )
+        residuals = np.broadcast_to(self.y - predicted, (count, self.y.size))
+        jacobian = np.broadcast_to(jacobian, (size, count, self.y.size))
+        gradients: np.ndarray = -2 * np.einsum('ikn,kn->ki', jacobian, residuals)
+        return gradients
+
+    def objective_terms_batch(
+        self,
+        keys: Sequence[str],
+        points: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        size, count = len(keys), len(points)
+        predicted, jacobian, second_derivs = self._call_func(
+            'hessian', count, self.func.value_gradient_hessian,
+            keys, self._batch_params(keys, points), size=size
+        )
+        residuals = np.broadcast_to(self.y - predicted, (count, self.y.size))
+        jacobian = np.broadcast_to(jacobian, (size, count, self.y.size))
+        second_derivs = np.broadcast_to(second_derivs, (size, size, count, self.y.size))
+
+        costs = np.sum(residuals * residuals, axis=-1)
+        gradients = -2 * np.einsum('ikn,kn->ki', jacobian, residuals)
+        hessians = (
+            2 * np.einsum('ikn,jkn->kij', jacobian, jacobian)
+            - 2 * np.einsum('ijkn,kn->kij', second_derivs, residuals)
+        )
+        return costs, gradients, hessians
+
+    def bound_arrays(self, keys: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        lower = np.array([self.bounds.get(k, (-np.inf, np.inf))[0] for k in keys], dtype=np.float64)
+        upper = np.array([self.bounds.get(k, (-np.inf, np.inf))[1] for k in keys], dtype=np.float64)
+        return lower, upper
+
+    def project(self, params: Dict[str, float]) -> Dict[str, float]:
+        if not self.bounds:
+            return dict(params)
+        return {k: self._clip(k, v) for k, v in params.items()}
+
+    def project_point(self, keys: Sequence[str], point: np.ndarray) -> np.ndarray:
+        if not self.bounds:
+            return point
+        lower, upper = self.bound_arrays(keys)
+        projected: np.ndarray = np.clip(point, lower, upper)
+        return projected
+
+    def reflect(self, params: Dict[str, float]) -> Dict[str, float]:
+        if not self.bounds:
+            return params
+        keys = list(params)
+        point = self.reflect_point(keys, np.array([params[k] for k in keys], dtype=np.float64))
+        return dict(zip(keys, map(float, point)))
+
+    def reflect_point(self, keys: Sequence[str], point: np.ndarray) -> np.ndarray:
+        if not self.bounds:
+            return point
+        lower, upper = self.bound_arrays(keys)
+        point = np.where(point < lower, 2 * lower - point, point)
+        point = np.where(point > upper, 2 * upper - point, point)
+        reflected: np.ndarray = np.clip(point, lower, upper)
+        return reflected
+
+    def free_mask(self, keys: Sequence[str], points: np.ndarray, gradients: np.ndarray) -> np.ndarray:
+        lower, upper = self.bound_arrays(keys)
+        return ~(((points <= lower) & (gradients > 0)) | ((points >= upper) & (gradients < 0)))
+
+    def fix_at_bounds(
+        self,
+        keys: Sequence[str],
+        points: np.ndarray,
+        gradients: np.ndarray,
+        hessians: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        free = self.free_mask(keys, points, gradients)
+        gradients = np.where(free, gradients, 0.0)
+        hessians = np.where(free[..., :, np.newaxis] & free[..., np.newaxis, :], hessians, 0.0)
+        index = np.arange(len(keys))
+        hessians[..., index, index] = np.where(free, hessians[..., index, index], 1.0)
+        return gradients, hessians
+
+    def _clip(self, key: str, value: float) -> float:
+        bound = self.bounds.get(key)
+        if bound is None:
+            return value
+        return float(min(max(value, bound[0]), bound[1]))
+
+    def _call_func(self, phase: str, count: int, call: Callable, *args, size: int = 1) -> Any:
+        if self._budgeted:
+            self._check_budget()
+            if (self.max_evaluations is not None and 'evaluate' in PHASE_KINDS[phase]
+                    and self.counts['evaluate'] + count > self.max_evaluations):
+                raise BudgetExceeded(STOP_MAX_EVALUATIONS)
+
+        for kind in PHASE_KINDS[phase]:
+            self.counts[kind] += count * _partial_count(kind, size)
+
+        if not self.profile:
+            return call(*args)
+
+        started = time.perf_counter()
+        result = call(*args)
+        self.phase_times[phase] = self.phase_times.get(phase, 0.0) + time.perf_counter() - started
+        return result
+
+    def _iteration(self, params: Any, cost: float, keys: Optional[Sequence[str]] = None) -> None:
+        self.iterations += 1
+        if self.callback is None and not self._budgeted:
+            return
+
+        if keys is not None:
+            params = dict(zip(keys, map(float, params)))
+        if self.callback is not None:
+            self.callback(IterationInfo(iteration=self.iterations, params=dict(params), cost=float(cost)))
+
+        if self._budgeted:
+            if self._best is None or cost < self._best[1]:
+                self._best = (dict(params), float(cost))
+            self._check_budget()
+
+    def _check_budget(self) -> None:
+        if self.cancel_token is not None and self.cancel_token.cancelled:
+            raise BudgetExceeded(STOP_CANCELLED)
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise BudgetExceeded(STOP_DEADLINE)
+
+    def _best_so_far(self, initial_params: Dict[str, float]) -> Tuple[Dict[str, float], float]:
+        self._budgeted = False
+        params = dict(initial_params)
+        if self.max_evaluations is not None and self.counts['evaluate'] >= self.max_evaluations:
+            return self._best if self._best is not None else (params, math.inf)
+
+        self.counts['evaluate'] += 1
+        residuals = self.y - self.func.evaluate_array(self._point_params(params))
+        cost = float(residuals @ residuals)
+
+        if self._best is not None and not cost < self._best[1]:
+            return self._best
+        return params, cost
+
+    def _batch_params(self, keys: Sequence[str], points: np.ndarray) -> Dict[str, Any]:
+        columns = {key: points[:, i, np.newaxis] for i, key in enumerate(keys)}
+        return {**columns, 'x': self.x, 'temp': self.temperature}
+
+    def _point_params(self, params: Dict[str, float]) -> Dict[str, Any]:
+        return {**params, 'x': self.x, 'temp': self.temperature}
+
+    def _per_point(self, values: np.ndarray, *leading: int) -> np.ndarray:
+        values = values.reshape(leading + (-1,))
+        return np.broadcast_to(values, leading + (self.y.size,))
 
     @abstractmethod
     def optimize(self, initial_params: Dict[str, float], **kwargs) -> Tuple[Dict[str, float], float]:
@@ -48,6 +384,10 @@ class OptimizationMethod(ABC):
 
 
 class SimulatedAnnealing(OptimizationMethod):
+    @classmethod
+    def is_deterministic(cls, options: Dict[str, Any]) -> bool:
+        return False
+
     @staticmethod
     def temperature_schedule(iteration: int) -> float:
         return 10 / math.log(1 + iteration)
@@ -72,7 +412,7 @@ class SimulatedAnnealing(OptimizationMethod):
 
         for iteration in range(1, max_iterations + 1):
             temp = self.temperature_schedule(iteration)
-            new = {k: self.neighbor(v, temp) for k, v in current.items()}
+            new = self.reflect({k: self.neighbor(v, temp) for k, v in current.items()})
             new_cost = self.objective_sum(new)
 
             if self.acceptance_probability(best_cost, new_cost, temp) >= random.random():
@@ -81,10 +421,94 @@ class SimulatedAnnealing(OptimizationMethod):
                     best = new.copy()
                     best_cost = new_cost
 
+            self._iteration(best, best_cost)
+
         return best, best_cost
 
 
+class ParallelTempering(OptimizationMethod):
+    def __init__(self, func: MathFunction, data: List[Tuple[float, float]], temperature: float, seed: Optional[int] = None, **options):
+        super().__init__(func, data, temperature, **options)
+        self.rng = np.random.default_rng(seed)
+
+    @classmethod
+    def is_deterministic(cls, options: Dict[str, Any]) -> bool:
+        return options.get('seed') is not None
+
+    def optimize(
+        self,
+        initial_params: Dict[str, float],
+        max_iterations: int = 10000,
+        chains: int = 8,
+        step_size: float = 1.0,
+        swap_interval: int = 10,
+        patience: int = 1000,
+        tolerance: float = 1e-9,
+        seed: Optional[int] = None,
+        **kwargs
+    ) -> Tuple[Dict[str, float], float]:
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+
+        keys = list(initial_params)
+        start = np.array([initial_params[k] for k in keys], dtype=np.float64)
+        states = np.tile(start, (chains, 1))
+        costs = self.objective_batch(keys, states)
+
+        ladder = np.geomspace(1e-4, 1.0, chains)
+        temperatures = ladder * max(float(costs[0]), 1.0)
+        steps = ladder * step_size
+        accepted = np.zeros(chains)
+
+        best = start.copy()
+        best_cost = float(costs[0])
+        last_improvement = 0
+
+        for iteration in range(1, max_iterations + 1):
+            proposals = states + self.rng.uniform(-0.5, 0.5, states.shape) * steps[:, np.newaxis]
+            proposals = self.reflect_point(keys, proposals)
+            proposal_costs = self.objective_batch(keys, proposals)
+
+            with np.errstate(over='ignore', invalid='ignore'):
+                probabilities = np.exp((costs - proposal_costs) / temperatures)
+            moves = np.isfinite(proposal_costs) & (self.rng.random(chains) < probabilities)
+            states[moves] = proposals[moves]
+            costs[moves] = proposal_costs[moves]
+            accepted += moves
+
+            coldest = int(np.argmin(costs))
+            if costs[coldest] < best_cost - tolerance * max(abs(best_cost), 1.0):
+                best = states[coldest].copy()
+                best_cost = float(costs[coldest])
+                last_improvement = iteration
+            elif iteration - last_improvement >= patience:
+                break
+
+            self._iteration(best, best_cost, keys)
+
+            if iteration % swap_interval == 0:
+                self._swap(states, costs, temperatures, iteration // swap_interval % 2)
+
+            if iteration % 100 == 0:
+                rates = accepted / 100
+                steps[rates > 0.4] *= 1.5
+                steps[rates < 0.2] *= 0.5
+                accepted[:] = 0
+
+        return dict(zip(keys, map(float, best))), best_cost
+
+    def _swap(self, states: np.ndarray, costs: np.ndarray, temperatures: np.ndarray, offset: int) -> None:
+        for i in range(offset, len(states) - 1, 2):
+            j = i + 1
+            exponent = (costs[i] - costs[j]) * (1 / temperatures[i] - 1 / temperatures[j])
+            if exponent >= 0 or self.rng.random() < math.exp(exponent):
+                states[[i, j]] = states[[j, i]]
+                costs[[i, j]] = costs[[j, i]]
+
+
 class GaussSeidel(OptimizationMethod):
+    memo_size = 4096
+
     def optimize(self, initial_params: Dict[str, float], max_iterations: int = 1000, tolerance: float = 1e-6, **kwargs) -> Tuple[Dict[str, float], float]:
         current = initial_params.copy()
         step_sizes = {k: 1.0 for k in current}
@@ -93,23 +517,26 @@ class GaussSeidel(OptimizationMethod):
 
         for _ in range(max_iterations):
             for key in current:
-                current[key] += step_sizes[key]
+                original = current[key]
+                current[key] = self._clip(key, original + step_sizes[key])
                 new_cost = self.objective_sum(current)
                 
                 if new_cost < best_cost:
                     best_cost = new_cost
                     best = current.copy()
                 else:
-                    current[key] -= 2 * step_sizes[key]
+                    current[key] = self._clip(key, original - step_sizes[key])
                     new_cost = self.objective_sum(current)
                     
                     if new_cost < best_cost:
                         best_cost = new_cost
                         best = current.copy()
                     else:
-                        current[key] += step_sizes[key]
+                        current[key] = original
                         step_sizes[key] /= 2
 
+            self._iteration(best, best_cost)
+
             if all(size < tolerance for size in step_sizes.values()):
                 break
 
@@ -117,18 +544,23 @@ class GaussSeidel(OptimizationMethod):
 
 
 class HookeJeeves(OptimizationMethod):
-    def optimize(self, initial_params: Dict[str, float], step_size: float = 1.0, tolerance: float = 1e-6, **kwargs) -> Tuple[Dict[str, float], float]:
+    memo_size = 4096
+
+    def optimize(self, initial_params: Dict[str, float], step_size: float = 1.0, tolerance: float = 1e-6, max_iterations: int = 10000, **kwargs) -> Tuple[Dict[str, float], float]:
         current = initial_params.copy()
         best = current.copy()
         best_cost = self.objective_sum(best)
 
-        while step_size > tolerance:
+        for _ in range(max_iterations):
+            if step_size <= tolerance:
+                break
+
             improved = False
             
             for key in current:
                 original = current[key]
                 
-                current[key] = original + step_size
+                current[key] = self._clip(key, original + step_size)
                 new_cost = self.objective_sum(current)
                 
                 if new_cost < best_cost:
@@ -136,7 +568,7 @@ class HookeJeeves(OptimizationMethod):
                     best = current.copy()
                     improved = True
                 else:
-                    current[key] = original - step_size
+                    current[key] = self._clip(key, original - step_size)
                     new_cost = self.objective_sum(current)
                     
                     if new_cost < best_cost:
@@ -146,6 +578,8 @@ class HookeJeeves(OptimizationMethod):
                     else:
                         current[key] = original
 
+            self._iteration(best, best_cost)
+
             if not improved:
                 step_size /= 2
 
@@ -159,17 +593,21 @@ class GradientDescent(OptimizationMethod):
         lr = learning_rate
 
         for _ in range(max_iterations):
-            gradient = {k: self.gradient_component(params, k) for k in params}
+            gradient = self.gradient(params)
+            previous = params.copy()
             
-            for k in params:
-                params[k] -= lr * gradient[k]
+            for k, g in zip(params, gradient):
+                params[k] -= lr * float(g)
+            params = self.project(params)
             
             cost = self.objective_sum(params)
+            self._iteration(params, cost)
             
             if abs(prev_cost - cost) < tolerance:
                 break
             
             if cost > prev_cost:
+                params = previous
                 lr *= 0.5
             else:
                 prev_cost = cost
@@ -182,31 +620,24 @@ class NewtonMethod(OptimizationMethod):
         current = initial_params.copy()
         
         for _ in range(max_iterations):
-            prev_cost = self.objective_sum(current)
-            
-            hessian_dict = {}
-            for i, key1 in enumerate(current):
-                for j, key2 in enumerate(current):
-                    hessian_dict[i, j] = self.hessian_component(current, key1, key2)
-            
-            hessian = sympy.SparseMatrix.from_dok(len(current), len(current), hessian_dict)
+            prev_cost, gradient, hessian = self.objective_terms(current)
+            if self.bounds:
+                point = np.array(list(current.values()), dtype=np.float64)
+                gradient, hessian = self.fix_at_bounds(list(current), point, gradient, hessian)
+            if not np.isfinite(hessian).all() or np.linalg.cond(hessian) >= 1 / np.finfo(float).eps:
+                break
             
             try:
-                inv_hessian = hessian.inv()
-            except:
+                delta = np.linalg.solve(hessian, gradient)
+            except np.linalg.LinAlgError:
                 break
             
-            gradient_dict = {}
-            for i, key in enumerate(current):
-                gradient_dict[i, 0] = self.gradient_component(current, key)
-            
-            gradient = sympy.SparseMatrix.from_dok(len(current), 1, gradient_dict)
-            delta = inv_hessian * gradient
-            
             for i, key in enumerate(current):
                 current[key] -= float(delta[i])
+            current = self.project(current)
             
             new_cost = self.objective_sum(current)
+            self._iteration(current, new_cost)
             
             if abs(prev_cost - new_cost) < tolerance:
                 break
@@ -214,15 +645,217 @@ class NewtonMethod(OptimizationMethod):
         return current, self.objective_sum(current)
 
 
-OPTIMIZATION_METHODS = {
+class LevenbergMarquardt(OptimizationMethod):
+    def optimize(self, initial_params: Dict[str, float], max_iterations: int = 100, tolerance: float = 1e-6, damping: float = 1e-3, **kwargs) -> Tuple[Dict[str, float], float]:
+        keys = list(initial_params)
+        current = initial_params.copy()
+        residuals, jacobian = self.residuals_and_jacobian(current)
+        cost = float(residuals @ residuals)
+
+        for _ in range(max_iterations):
+            active = jacobian
+            if self.bounds:
+                point = np.array([current[k] for k in keys], dtype=np.float64)
+                free = self.free_mask(keys, point, -2 * jacobian @ residuals)
+                active = np.where(free[:, np.newaxis], jacobian, 0.0)
+
+            scale = np.sqrt(np.sum(active * active, axis=1))
+            scale[scale == 0] = 1.0
+            improved = False
+
+            while damping < 1e12:
+                system = np.vstack([active.T, np.diag(np.sqrt(damping) * scale)])
+                rhs = np.concatenate([residuals, np.zeros(len(keys))])
+                delta = np.linalg.lstsq(system, rhs, rcond=None)[0]
+
+                trial = self.project({k: current[k] + float(d) for k, d in zip(keys, delta)})
+                trial_residuals, trial_jacobian = self.residuals_and_jacobian(trial)
+                trial_cost = float(trial_residuals @ trial_residuals)
+
+                if np.isfinite(trial_cost) and trial_cost <= cost:
+                    damping = max(damping / 10, 1e-12)
+                    improved = True
+                    break
+                damping *= 10
+
+            if not improved:
+                break
+
+            prev_cost = cost
+            current, residuals, jacobian, cost = trial, trial_residuals, trial_jacobian, trial_cost
+            self._iteration(current, cost)
+
+            if abs(prev_cost - cost) < tolerance:
+                break
+
+        return current, cost
+
+
+class LBFGS(OptimizationMethod):
+    def optimize(self, initial_params: Dict[str, float], max_iterations: int = 500, tolerance: float = 1e-6, memory: int = 10, gtol: float = 1e-6, **kwargs) -> Tuple[Dict[str, float], float]:
+        keys = list(initial_params)
+        point = np.array([initial_params[k] for k in keys], dtype=np.float64)
+        cost, gradient = self._cost_and_gradient(keys, point)
+        history: Deque[Tuple[np.ndarray, np.ndarray, float]] = deque(maxlen=memory)
+        for _ in range(max_iterations):
+            free = self.free_mask(keys, point, gradient)
+            if float(np.linalg.norm(gradient[free])) <= gtol * max(cost, 1.0):
+                break
+
+            direction = -self._two_loop(gradient, history)
+            direction[~free] = 0.0
+            slope = float(gradient @ direction)
+            if slope >= 0:
+                history.clear()
+                direction = np.where(free, -gradient, 0.0)
+                slope = float(gradient @ direction)
+
+            step = 1.0 if history else min(1.0, 1.0 / float(np.linalg.norm(gradient[free])))
+            while True:
+                trial = self.project_point(keys, point + step * direction)
+                trial_cost, trial_gradient = self._cost_and_gradient(keys, trial)
+                decrease = float(gradient @ (trial - point))
+                if np.isfinite(trial_cost) and trial_cost <= cost + 1e-4 * decrease:
+                    break
+                step *= 0.5
+                if step < 1e-16:
+                    return dict(zip(keys, map(float, point))), cost
+
+            s_vec, y_vec = trial - point, trial_gradient - gradient
+            curvature = float(s_vec @ y_vec)
+            if curvature > 1e-12:
+                history.append((s_vec, y_vec, 1.0 / curvature))
+
+            prev_cost = cost
+            point, cost, gradient = trial, trial_cost, trial_gradient
+            self._iteration(point, cost, keys)
+
+            if abs(prev_cost - cost) < tolerance:
+                break
+
+        return dict(zip(keys, map(float, point))), cost
+
+    def _cost_and_gradient(self, keys: List[str], point: np.ndarray) -> Tuple[float, np.ndarray]:
+        residuals, jacobian = self.residuals_and_jacobian(dict(zip(keys, map(float, point))))
+        return float(residuals @ residuals), -2 * jacobian @ residuals
+
+    @staticmethod
+    def _two_loop(gradient: np.ndarray, history: Deque[Tuple[np.ndarray, np.ndarray, float]]) -> np.ndarray:
+        q: np.ndarray = gradient.copy()
+        alphas = []
+
+        for s_vec, y_vec, rho in reversed(history):
+            alpha = rho * float(s_vec @ q)
+            q -= alpha * y_vec
+            alphas.append(alpha)
+
+        if history:
+            s_vec, y_vec, _ = history[-1]
+            q *= float(s_vec @ y_vec) / float(y_vec @ y_vec)
+
+        for (s_vec, y_vec, rho), alpha in zip(history, reversed(alphas)):
+            beta = rho * float(y_vec @ q)
+            q += (alpha - beta) * s_vec
+
+        return q
+
+
+class NelderMead(OptimizationMethod):
+    def optimize(self, initial_params: Dict[str, float], max_iterations: int = 0, tolerance: float = 1e-6, initial_step: float = 0.05, **kwargs) -> Tuple[Dict[str, float], float]:
+        keys = list(initial_params)
+        size = len(keys)
+        max_iterations = max_iterations or 200 * max(size, 1)
+
+        origin = self._to_internal(keys, np.array([initial_params[k] for k in keys], dtype=np.float64))
+        simplex = np.tile(origin, (size + 1, 1))
+        for i in range(size):
+            simplex[i + 1, i] += initial_step * origin[i] if origin[i] != 0 else 0.00025
+        costs = np.array([self._cost(keys, vertex) for vertex in simplex])
+
+        for _ in range(max_iterations):
+            order = np.argsort(costs)
+            simplex, costs = simplex[order], costs[order]
+            self._iteration(simplex[0], costs[0], keys)
+
+            if (np.max(np.abs(costs[1:] - costs[0])) <= tolerance
+                    and np.max(np.abs(simplex[1:] - simplex[0])) <= tolerance):
+                break
+
+            centroid = simplex[:-1].mean(axis=0)
+            reflected = centroid + (centroid - simplex[-1])
+            reflected_cost = self._cost(keys, reflected)
+
+            if reflected_cost < costs[0]:
+                expanded = centroid + 2 * (centroid - simplex[-1])
+                expanded_cost = self._cost(keys, expanded)
+                if expanded_cost < reflected_cost:
+                    simplex[-1], costs[-1] = expanded, expanded_cost
+                else:
+                    simplex[-1], costs[-1] = reflected, reflected_cost
+                continue
+
+            if reflected_cost < costs[-2]:
+                simplex[-1], costs[-1] = reflected, reflected_cost
+                continue
+
+            if reflected_cost < costs[-1]:
+                contracted = centroid + 0.5 * (reflected - centroid)
+            else:
+                contracted = centroid + 0.5 * (simplex[-1] - centroid)
+            contracted_cost = self._cost(keys, contracted)
+
+            if contracted_cost < min(reflected_cost, costs[-1]):
+                simplex[-1], costs[-1] = contracted, contracted_cost
+                continue
+
+            simplex[1:] = simplex[0] + 0.5 * (simplex[1:] - simplex[0])
+            costs[1:] = [self._cost(keys, vertex) for vertex in simplex[1:]]
+
+        best = int(np.argmin(costs))
+        point = self._to_external(keys, simplex[best])
+        return dict(zip(keys, map(float, point))), float(costs[best])
+
+    def _cost(self, keys: List[str], point: np.ndarray) -> float:
+        point = self._to_external(keys, point)
+        cost = self.objective_sum(dict(zip(keys, map(float, point))))
+        return cost if np.isfinite(cost) else np.inf
+
+    def _to_internal(self, keys: List[str], point: np.ndarray) -> np.ndarray:
+        if not self.bounds:
+            return point
+        lower, width, boxed = self._box(keys)
+        scaled = np.clip(2 * (point - lower) / width - 1, -1.0, 1.0)
+        return np.where(boxed, np.arcsin(scaled), self.project_point(keys, point))
+
+    def _to_external(self, keys: List[str], point: np.ndarray) -> np.ndarray:
+        if not self.bounds:
+            return point
+        lower, width, boxed = self._box(keys)
+        return np.where(boxed, lower + width * (np.sin(point) + 1) / 2, self.project_point(keys, point))
+
+    def _box(self, keys: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        lower, upper = self.bound_arrays(keys)
+        boxed = np.isfinite(lower) & np.isfinite(upper) & (upper > lower)
+        return np.where(boxed, lower, 0.0), np.where(boxed, upper - lower, 1.0), boxed
+
+
+OPTIMIZATION_METHODS: Dict[int, Type[OptimizationMethod]] = {
     0: SimulatedAnnealing,
     1: GaussSeidel,
     2: HookeJeeves,
     3: GradientDescent,
     4: NewtonMethod,
+    5: LevenbergMarquardt,
+    6: LBFGS,
+    7: NelderMead,
+    8: ParallelTempering,
 }
 
 
-def get_optimizer(method_id: int, func: MathFunction, data: List[Tuple[float, float]], temperature: float) -> OptimizationMethod:
+def is_deterministic(method_id: int, options: Dict[str, Any]) -> bool:
+    return OPTIMIZATION_METHODS.get(method_id, SimulatedAnnealing).is_deterministic(options)
+
+
+def get_optimizer(method_id: int, func: MathFunction, data: List[Tuple[float, float]], temperature: float, **options) -> OptimizationMethod:
     method_class = OPTIMIZATION_METHODS.get(method_id, SimulatedAnnealing)
-    return method_class(func, data, temperature)
\ No newline at end of file
+    return method_class(func, data, temperature, **options)
\ No newline at end of file
@@ -0,0 +1,175 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from calculation.budget import (
+    STOP_CANCELLED,
+    STOP_COMPLETED,
+    STOP_DEADLINE,
+    STOP_MAX_EVALUATIONS,
+    CancellationToken,
+)
+from calculation.optimizer import GradientDescent, NewtonMethod, OptimizationMethod
+
+
+@dataclass
+class PopulationResult:
+    params: List[Dict[str, float]] = field(default_factory=list)
+    costs: List[float] = field(default_factory=list)
+    iterations: int = 0
+    elapsed: float = 0.0
+    stop_reason: str = STOP_COMPLETED
+
+    @property
+    def starts_per_second(self) -> float:
+        return len(self.params) / self.elapsed if self.elapsed > 0 else float('inf')
+
+
+class PopulationEngine:
+    def __init__(self, method: OptimizationMethod):
+        self.method = method
+        self.deadline: Optional[float] = None
+        self.max_evaluations: Optional[int] = None
+        self.cancel_token: Optional[CancellationToken] = None
+        self.stop_reason = STOP_COMPLETED
+
+    @staticmethod
+    def supports(method: OptimizationMethod) -> bool:
+        return isinstance(method, (GradientDescent, NewtonMethod))
+
+    def optimize(
+        self,
+        starts: Sequence[Dict[str, float]],
+        bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+        time_limit: Optional[float] = None,
+        max_evaluations: Optional[int] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        **kwargs
+    ) -> PopulationResult:
+        if not starts:
+            return PopulationResult()
+
+        self.method.bounds = dict(bounds or {})
+        keys = list(starts[0])
+        points = np.array([[start[key] for key in keys] for start in starts], dtype=np.float64)
+        points = self.method.project_point(keys, points)
+        began = time.perf_counter()
+        self.deadline = began + time_limit if time_limit else None
+        self.max_evaluations = max_evaluations or None
+        self.cancel_token = cancel_token
+        self.stop_reason = STOP_COMPLETED
+
+        if isinstance(self.method, NewtonMethod):
+            points, iterations = self.newton(keys, points, **kwargs)
+        elif isinstance(self.method, GradientDescent):
+            points, iterations = self.gradient_descent(keys, points, **kwargs)
+        else:
+            raise ValueError(f'{type(self.method).__name__} has no population implementation')
+
+        costs = self.method.objective_batch(keys, points)
+        return PopulationResult(
+            params=[dict(zip(keys, map(float, row))) for row in points],
+            costs=[float(cost) for cost in costs],
+            iterations=iterations,
+            elapsed=time.perf_counter() - began,
+            stop_reason=self.stop_reason,
+        )
+
+    def _interrupted(self) -> bool:
+        if self.cancel_token is not None and self.cancel_token.cancelled:
+            self.stop_reason = STOP_CANCELLED
+        elif self.deadline is not None and time.perf_counter() >= self.deadline:
+            self.stop_reason = STOP_DEADLINE
+        else:
+            return False
+        return True
+
+    def _affordable(self, used: np.ndarray, cost: int) -> np.ndarray:
+        if self.max_evaluations is None:
+            return np.ones(len(used), dtype=bool)
+        affordable = used + cost <= self.max_evaluations
+        if not affordable.all():
+            self.stop_reason = STOP_MAX_EVALUATIONS
+        return affordable
+
+    def gradient_descent(
+        self,
+        keys: List[str],
+        points: np.ndarray,
+        max_iterations: int = 5000,
+        learning_rate: float = 1e-3,
+        tolerance: float = 1e-6,
+        **kwargs
+    ) -> Tuple[np.ndarray, int]:
+        points = points.copy()
+        prev_costs = self.method.objective_batch(keys, points)
+        rates = np.full(len(points), learning_rate)
+        used = np.ones(len(points), dtype=int)
+        active = np.arange(len(points))
+        iteration = 0
+
+        for iteration in range(1, max_iterations + 1):
+            active = active[self._affordable(used[active], 2)]
+            if active.size == 0 or self._interrupted():
+                break
+
+            used[active] += 2
+            current = points[active]
+            gradients = self.method.gradient_batch(keys, current)
+            trial = self.method.project_point(keys, current - rates[active, np.newaxis] * gradients)
+            costs = self.method.objective_batch(keys, trial)
+
+            converged = np.abs(prev_costs[active] - costs) < tolerance
+            worse = (costs > prev_costs[active]) & ~converged
+            accepted = ~worse
+
+            points[active[accepted]] = trial[accepted]
+            improved = accepted & ~converged
+            prev_costs[active[improved]] = costs[improved]
+            rates[active[worse]] *= 0.5
+
+            active = active[~converged & np.isfinite(costs)]
+
+        return points, iteration
+
+    def newton(
+        self,
+        keys: List[str],
+        points: np.ndarray,
+        max_iterations: int = 100,
+        tolerance: float = 1e-6,
+        **kwargs
+    ) -> Tuple[np.ndarray, int]:
+        points = points.copy()
+        used = np.zeros(len(points), dtype=int)
+        active = np.arange(len(points))
+        iteration = 0
+
+        for iteration in range(1, max_iterations + 1):
+            active = active[self._affordable(used[active], 2)]
+            if active.size == 0 or self._interrupted():
+                break
+
+            used[active] += 2
+            current = points[active]
+            prev_costs, gradients, hessians = self.method.objective_terms_batch(keys, current)
+            if self.method.bounds:
+                gradients, hessians = self.method.fix_at_bounds(keys, current, gradients, hessians)
+
+            solvable = np.isfinite(hessians).all(axis=(1, 2))
+            if solvable.any():
+                solvable[solvable] = np.linalg.cond(hessians[solvable]) < 1 / np.finfo(float).eps
+            active, current = active[solvable], current[solvable]
+            if active.size == 0:
+                break
+
+            deltas = np.linalg.solve(hessians[solvable], gradients[solvable][..., np.newaxis])[..., 0]
+            points[active] = self.method.project_point(keys, current - deltas)
+            costs = self.method.objective_batch(keys, points[active])
+
+            converged = np.abs(prev_costs[solvable] - costs) < tolerance
+            active = active[~converged & np.isfinite(costs)]
+
+        return points, iteration
@@ -0,0 +1,110 @@
+import statistics
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from calculation.function import MathFunction
+from calculation.optimizer import OptimizationMethod, get_optimizer
+
+
+@dataclass
+class UncertaintyResult:
+    params: Dict[str, float]
+    cost: float
+    degrees_of_freedom: int
+    confidence: float
+    covariance: np.ndarray
+    standard_errors: Dict[str, float] = field(default_factory=dict)
+    intervals: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    bootstrap_errors: Dict[str, float] = field(default_factory=dict)
+    bootstrap_intervals: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    refits: int = 0
+    failed_refits: int = 0
+    first_error: Optional[str] = None
+    elapsed: float = 0.0
+    bootstrap_elapsed: float = 0.0
+
+
+def asymptotic_uncertainty(
+    optimizer: OptimizationMethod,
+    params: Dict[str, float],
+    confidence: float = 0.95
+) -> UncertaintyResult:
+    keys = list(params)
+    residuals, jacobian = optimizer.residuals_and_jacobian(params)
+    cost = float(residuals @ residuals)
+    dof = max(residuals.size - len(keys), 1)
+
+    covariance = cost / dof * np.linalg.pinv(jacobian @ jacobian.T)
+    errors = np.sqrt(np.clip(np.diag(covariance), 0.0, None))
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    return UncertaintyResult(
+        params=dict(params),
+        cost=cost,
+        degrees_of_freedom=dof,
+        confidence=confidence,
+        covariance=covariance,
+        standard_errors={k: float(e) for k, e in zip(keys, errors)},
+        intervals={k: (params[k] - z * float(e), params[k] + z * float(e)) for k, e in zip(keys, errors)},
+    )
+
+
+def resample(size: int, seed: int, index: int) -> np.ndarray:
+    rng = np.random.default_rng([seed, index])
+    return rng.integers(0, size, size)
+
+
+def bootstrap_refits(
+    func: MathFunction,
+    data: List[Tuple[float, float]],
+    temperature: float,
+    method_id: int,
+    params: Dict[str, float],
+    seed: int,
+    indices: Sequence[int],
+    options: Dict[str, Any]
+) -> Tuple[np.ndarray, Optional[str]]:
+    keys = list(params)
+    samples = np.full((len(indices), len(keys)), np.nan)
+    first_error = None
+
+    for row, index in enumerate(indices):
+        picks = resample(len(data), seed, index)
+        resampled = [data[i] for i in picks]
+        try:
+            optimized, cost = get_optimizer(method_id, func, resampled, temperature).run(params, **options)
+        except Exception as e:
+            if first_error is None:
+                first_error = f'{type(e).__name__}: {e}'
+            continue
+        if np.isfinite(cost):
+            samples[row] = [optimized[k] for k in keys]
+
+    return samples, first_error
+
+
+def summarize_bootstrap(
+    result: UncertaintyResult,
+    samples: np.ndarray,
+    elapsed: Optional[float] = None,
+    first_error: Optional[str] = None
+) -> UncertaintyResult:
+    keys = list(result.params)
+    valid = samples[np.isfinite(samples).all(axis=1)]
+    result.refits = len(samples)
+    result.failed_refits = len(samples) - len(valid)
+    result.first_error = first_error
+    if elapsed is not None:
+        result.bootstrap_elapsed = elapsed
+
+    if len(valid) < 2:
+        return result
+
+    tail = (1 - result.confidence) / 2 * 100
+    low, high = np.percentile(valid, [tail, 100 - tail], axis=0)
+    errors = np.std(valid, axis=0, ddof=1)
+    result.bootstrap_errors = {k: float(e) for k, e in zip(keys, errors)}
+    result.bootstrap_intervals = {k: (float(lo), float(hi)) for k, lo, hi in zip(keys, low, high)}
+    return result
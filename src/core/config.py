@@ -22,6 +22,18 @@ class Settings(BaseSettings):
     mysql_user: str = Field(default='root', alias='MYSQL_USER')
     mysql_password: str = Field(default='', alias='MYSQL_PASSWORD')
     mysql_database: str = Field(default='chemical_calc', alias='MYSQL_DATABASE')
+    db_pool_size: int = Field(default=5, alias='DB_POOL_SIZE')
+    db_pool_recycle: float = Field(default=3600.0, alias='DB_POOL_RECYCLE')
+    
+    expression_cache_size: int = Field(default=128, alias='EXPRESSION_CACHE_SIZE')
+    kernel_cache_dir: Path = Field(default=Path('.cache/kernels'), alias='KERNEL_CACHE_DIR')
+    multistart_workers: int = Field(default=0, alias='MULTISTART_WORKERS')
+    fit_time_limit: float = Field(default=0.0, alias='FIT_TIME_LIMIT')
+    result_cache_path: Path = Field(default=Path('.cache/results.db'), alias='RESULT_CACHE_PATH')
+    result_cache_size: int = Field(default=10000, alias='RESULT_CACHE_SIZE')
+    plot_point_budget: int = Field(default=400, alias='PLOT_POINT_BUDGET')
+    plot_cache_size: int = Field(default=32, alias='PLOT_CACHE_SIZE')
+    warm_start_temperature_window: float = Field(default=25.0, alias='WARM_START_TEMPERATURE_WINDOW')
     
     app_name: str = Field(default='Chemical Calculations', alias='APP_NAME')
     debug: bool = Field(default=False, alias='DEBUG')
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional
 
 
 @dataclass
@@ -9,7 +9,7 @@ class Experiment:
     second_element: str = ''
     temperature: Optional[float] = None
     pressure: Optional[float] = None
-    source_data: Dict[str, List[float]] = field(default_factory=dict)
+    source_data: Mapping[str, Any] = field(default_factory=dict)
     article_id: Optional[int] = None
 
     @property
@@ -40,6 +40,7 @@ class Model:
     initial_data: Dict[str, float] = field(default_factory=dict)
     calculated_parameter: str = ''
     argument: str = ''
+    derivative_mode: str = 'symbolic'
 
 
 @dataclass
@@ -58,4 +59,5 @@ class Attempt:
     model_id: Optional[int] = None
     method_id: int = 0
     init_data: Dict[str, Any] = field(default_factory=dict)
-    result_data: Dict[str, Any] = field(default_factory=dict)
\ No newline at end of file
+    result_data: Dict[str, Any] = field(default_factory=dict)
+    cost: Optional[float] = None
\ No newline at end of file
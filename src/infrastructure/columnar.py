@@ -0,0 +1,51 @@
+import struct
+from typing import Dict, Mapping, Sequence
+
+import numpy as np
+
+MAGIC = b'CCOL'
+VERSION = 1
+HEADER = struct.Struct('<4sBH')
+COLUMN = struct.Struct('<HI')
+DTYPE = np.dtype('<f8')
+
+
+def encode(columns: Mapping[str, Sequence[float]]) -> bytes:
+    names = []
+    arrays = []
+    for name, values in columns.items():
+        names.append(str(name).encode('utf-8'))
+        arrays.append(np.asarray(values, dtype=np.float64).astype(DTYPE, copy=False).ravel())
+
+    directory = [HEADER.pack(MAGIC, VERSION, len(arrays))]
+    for encoded, array in zip(names, arrays):
+        directory.append(COLUMN.pack(len(encoded), len(array)))
+        directory.append(encoded)
+
+    head = b''.join(directory)
+    padding = -len(head) % DTYPE.itemsize
+    return b''.join([head, b'\0' * padding] + [array.tobytes() for array in arrays])
+
+
+def decode(blob: bytes) -> Dict[str, np.ndarray]:
+    magic, version, count = HEADER.unpack_from(blob, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Unsupported columnar blob')
+
+    offset = HEADER.size
+    directory = []
+    for _ in range(count):
+        size, rows = COLUMN.unpack_from(blob, offset)
+        offset += COLUMN.size
+        directory.append((bytes(blob[offset:offset + size]).decode('utf-8'), rows))
+        offset += size
+
+    offset += -offset % DTYPE.itemsize
+    columns = {}
+    for name, rows in directory:
+        if rows:
+            columns[name] = np.frombuffer(blob, dtype=DTYPE, count=rows, offset=offset)
+        else:
+            columns[name] = np.empty(0, dtype=DTYPE)
+        offset += rows * DTYPE.itemsize
+    return columns
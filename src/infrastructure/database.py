@@ -1,41 +1,179 @@
+import os
+import queue
 import sqlite3
-from contextlib import contextmanager
-from typing import Any, Generator, Optional
+import threading
+import time
+from contextlib import contextmanager, suppress
+from typing import Any, Dict, Generator, List, Optional, Tuple
 
 import pymysql
 
 from core.config import settings
 
+DATABASE_ERRORS = (sqlite3.Error, pymysql.MySQLError)
 
 class DatabaseConnection:
-    def __init__(self):
-        self._connection: Optional[Any] = None
+    def __init__(self, pool_size: Optional[int] = None, recycle: Optional[float] = None):
+        self.pool_size = settings.db_pool_size if pool_size is None else pool_size
+        self.recycle = settings.db_pool_recycle if recycle is None else recycle
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._sqlite: List[Tuple[int, threading.Thread, sqlite3.Connection]] = []
+        self._metrics = {
+            'checkouts': 0,
+            'created': 0,
+            'reused': 0,
+            'closed': 0,
+            'failed_health_checks': 0,
+        }
 
     @contextmanager
     def get_connection(self) -> Generator[Any, None, None]:
-        if settings.db_type == 'sqlite':
-            conn = sqlite3.connect(str(settings.sqlite_path))
-            conn.row_factory = sqlite3.Row
-        elif settings.db_type == 'mysql':
-            conn = pymysql.connect(
-                host=settings.mysql_host,
-                port=settings.mysql_port,
-                user=settings.mysql_user,
-                password=settings.mysql_password,
-                database=settings.mysql_database,
-                cursorclass=pymysql.cursors.DictCursor
-            )
-        else:
-            raise ValueError(f'Unsupported database type: {settings.db_type}')
+        active = getattr(self._local, 'active', None)
+        if active is not None and active[2] == os.getpid():
+            self._count('checkouts')
+            yield active[0]
+            return
 
+        conn, release = self._checkout()
+        self._local.active = (conn, release, os.getpid())
         try:
             yield conn
             conn.commit()
         except Exception:
-            conn.rollback()
+            try:
+                conn.rollback()
+            except Exception:
+                release = self._discard
             raise
         finally:
+            self._local.active = None
+            release(conn)
+
+    @property
+    def placeholder(self) -> str:
+        return '%s' if settings.db_type == 'mysql' else '?'
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics['sqlite_connections'] = len(self._sqlite)
+        metrics['idle'] = self._idle.qsize()
+        metrics['pool_size'] = self.pool_size
+        return metrics
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for key in self._metrics:
+                self._metrics[key] = 0
+
+    def close_all(self) -> None:
+        with self._lock:
+            connections: List[Tuple[int, Any]] = [(pid, conn) for pid, _, conn in self._sqlite]
+            self._sqlite = []
+        while True:
+            try:
+                conn, pid, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            connections.append((pid, conn))
+
+        for pid, conn in connections:
+            if pid != os.getpid():
+                continue
+            try:
+                conn.close()
+            except Exception:
+                continue
+            self._count('closed')
+        self._local = threading.local()
+
+    def _checkout(self) -> Tuple[Any, Any]:
+        self._count('checkouts')
+        if settings.db_type == 'sqlite':
+            return self._sqlite_connection(), self._keep
+        if settings.db_type == 'mysql':
+            return self._mysql_connection(), self._release
+        raise ValueError(f'Unsupported database type: {settings.db_type}')
+
+    def _sqlite_connection(self) -> sqlite3.Connection:
+        path = str(settings.sqlite_path)
+        cached: Optional[Tuple[str, int, sqlite3.Connection]] = getattr(self._local, 'sqlite', None)
+        if cached is not None and cached[0] == path and cached[1] == os.getpid():
+            self._count('reused')
+            return cached[2]
+
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        with self._lock:
+            stale = [
+                item for item in self._sqlite
+                if item[0] == os.getpid() and (not item[1].is_alive() or (cached is not None and item[2] is cached[2]))
+            ]
+            self._sqlite = [item for item in self._sqlite if item[0] == os.getpid() and item not in stale]
+            self._sqlite.append((os.getpid(), threading.current_thread(), conn))
+            self._metrics['created'] += 1
+        for _, _, stale_conn in stale:
+            self._discard(stale_conn)
+        self._local.sqlite = (path, os.getpid(), conn)
+        return conn
+
+    def _mysql_connection(self) -> Any:
+        while True:
+            try:
+                conn, pid, created = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if pid != os.getpid():
+                continue
+            if self.recycle and time.monotonic() - created > self.recycle:
+                self._discard(conn)
+                continue
+            try:
+                conn.ping(reconnect=False)
+            except Exception:
+                self._count('failed_health_checks')
+                self._discard(conn)
+                continue
+            self._count('reused')
+            self._local.created = created
+            return conn
+
+        conn = pymysql.connect(
+            host=settings.mysql_host,
+            port=settings.mysql_port,
+            user=settings.mysql_user,
+            password=settings.mysql_password,
+            database=settings.mysql_database,
+            cursorclass=pymysql.cursors.DictCursor
+        )
+        self._count('created')
+        self._local.created = time.monotonic()
+        return conn
+
+    def _keep(self, conn: Any) -> None:
+        pass
+
+    def _release(self, conn: Any) -> None:
+        if self._idle.qsize() >= self.pool_size:
+            self._discard(conn)
+            return
+        self._idle.put((conn, os.getpid(), getattr(self._local, 'created', time.monotonic())))
+
+    def _discard(self, conn: Any) -> None:
+        cached = getattr(self._local, 'sqlite', None)
+        if cached is not None and cached[2] is conn:
+            self._local.sqlite = None
+            with self._lock:
+                self._sqlite = [item for item in self._sqlite if item[2] is not conn]
+        with suppress(Exception):
             conn.close()
+        self._count('closed')
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._metrics[key] += 1
 
 
-db_connection = DatabaseConnection()
\ No newline at end of file
+db_connection = DatabaseConnection()
@@ -0,0 +1,51 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Generator, Hashable, Optional, Tuple
+
+
+class IdentityMap:
+    def __init__(self):
+        self._items: Dict[Tuple[type, Hashable], Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def contains(self, kind: type, key: Hashable) -> bool:
+        return (kind, key) in self._items
+
+    def get(self, kind: type, key: Hashable) -> Any:
+        self.hits += 1
+        return self._items[(kind, key)]
+
+    def get_or_load(self, kind: type, key: Hashable, loader: Callable[[], Any]) -> Any:
+        if self.contains(kind, key):
+            return self.get(kind, key)
+
+        self.misses += 1
+        value = loader()
+        self._items[(kind, key)] = value
+        return value
+
+    def discard(self, kind: type) -> None:
+        self._items = {item: value for item, value in self._items.items() if item[0] is not kind}
+
+
+_current: ContextVar[Optional[IdentityMap]] = ContextVar('identity_map', default=None)
+
+
+def current_identity_map() -> Optional[IdentityMap]:
+    return _current.get()
+
+
+@contextmanager
+def identity_scope() -> Generator[IdentityMap, None, None]:
+    existing = _current.get()
+    if existing is not None:
+        yield existing
+        return
+
+    identity_map = IdentityMap()
+    token = _current.set(identity_map)
+    try:
+        yield identity_map
+    finally:
+        _current.reset(token)
@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy
+import sympy
+
+from core.config import settings
+from domain.models import Model
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+class KernelStore:
+    def __init__(self, directory: Path):
+        directory = Path(directory).expanduser()
+        self.directory = directory if directory.is_absolute() else PROJECT_ROOT / directory
+
+    @staticmethod
+    def digest(model: Model) -> str:
+        key = json.dumps([
+            ''.join(model.equation.split()),
+            model.derivative_mode,
+            sympy.__version__,
+            numpy.__version__,
+            sys.version_info[:2],
+        ])
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+    def load(self, model: Model) -> Optional[Dict[str, Any]]:
+        path = self._path(model)
+        if path is None or not path.exists():
+            return None
+
+        try:
+            with open(path, encoding='utf-8') as f:
+                data: Dict[str, Any] = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        digest = self.digest(model)
+        if data.get('digest') != digest or data.get('checksum') != self._checksum(digest, data.get('kernels')):
+            return None
+        return data
+
+    def save(self, model: Model, payload: Dict[str, Any]) -> None:
+        path = self._path(model)
+        if path is None:
+            return
+
+        digest = self.digest(model)
+        payload = {
+            **payload,
+            'digest': digest,
+            'checksum': self._checksum(digest, payload.get('kernels')),
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+    def invalidate(self, model_id: int, keep: Optional[str] = None) -> None:
+        if not self.directory.exists():
+            return
+
+        for path in self.directory.glob(f'{model_id}-*.json'):
+            if keep is None or path.stem != f'{model_id}-{keep}':
+                path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _checksum(digest: str, kernels: Any) -> str:
+        content = json.dumps([digest, kernels], sort_keys=True)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def _path(self, model: Model) -> Optional[Path]:
+        if model.id is None:
+            return None
+        return self.directory / f'{model.id}-{self.digest(model)}.json'
+
+
+kernel_store = KernelStore(settings.kernel_cache_dir)
@@ -1,8 +1,27 @@
 import json
-from typing import Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+import numpy as np
 
 from domain.models import Article, Attempt, Element, Experiment, Model
+from infrastructure import columnar
 from infrastructure.database import db_connection
+from infrastructure.identity_map import current_identity_map
+from infrastructure.kernel_store import kernel_store
+
+T = TypeVar('T')
 
 
 class BaseRepository:
@@ -14,65 +33,204 @@ class BaseRepository:
             return {key: row[key] for key in row.keys()}
         return dict(row)
 
+    def _identity(self, kind: type, key: Hashable, loader: Callable[[], T]) -> T:
+        identity_map = current_identity_map()
+        if identity_map is None:
+            return loader()
+        value: T = identity_map.get_or_load(kind, key, loader)
+        return value
+
+    def _forget(self, kind: type) -> None:
+        identity_map = current_identity_map()
+        if identity_map is not None:
+            identity_map.discard(kind)
+
+
+class LazySourceData(Mapping):
+    def __init__(self, loader: Callable[[], Dict[str, np.ndarray]]):
+        self._loader = loader
+        self._data: Optional[Dict[str, np.ndarray]] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    def _load(self) -> Dict[str, np.ndarray]:
+        if self._data is None:
+            self._data = self._loader()
+        return self._data
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self._load()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __repr__(self) -> str:
+        return repr(self._data) if self.loaded else 'LazySourceData(<not loaded>)'
+
 
 class ExperimentRepository(BaseRepository):
-    def get_all(self) -> List[Experiment]:
+    METADATA_COLUMNS = 'id, first_element, second_element, temperature, pressure, article'
+    DATA_COLUMNS = 'source_blob, CASE WHEN source_blob IS NULL THEN source_data END AS source_data'
+    COLUMNS = f'{METADATA_COLUMNS}, {DATA_COLUMNS}'
+
+    def get_all(self, lazy: bool = False) -> List[Experiment]:
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT * FROM experiments')
+            cursor.execute(f'SELECT {self._columns(lazy)} FROM experiments')
             rows = cursor.fetchall()
-            return [self._row_to_experiment(row) for row in rows]
+            return [self._row_to_experiment(row, lazy) for row in rows]
 
     def get_by_id(self, experiment_id: int) -> Optional[Experiment]:
+        return self._identity(Experiment, experiment_id, lambda: self._load_by_id(experiment_id))
+
+    def _load_by_id(self, experiment_id: int) -> Optional[Experiment]:
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT * FROM experiments WHERE id = ?', (experiment_id,))
+            cursor.execute(f'SELECT {self.COLUMNS} FROM experiments WHERE id = ?', (experiment_id,))
             row = cursor.fetchone()
             return self._row_to_experiment(row) if row else None
 
+    def get_source_data(self, experiment_id: int) -> Dict[str, np.ndarray]:
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'SELECT {self.DATA_COLUMNS} FROM experiments WHERE id = ?', (experiment_id,))
+            row = cursor.fetchone()
+            return self._decode_source(self._row_to_dict(row)) if row else {}
+
     def create(self, experiment: Experiment) -> int:
+        self._forget(Experiment)
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            source_data_json = json.dumps(experiment.source_data)
+            try:
+                source_data_json, source_blob = None, columnar.encode(experiment.source_data)
+            except (TypeError, ValueError):
+                source_data_json, source_blob = json.dumps(experiment.source_data), None
             cursor.execute(
                 '''INSERT INTO experiments 
-                   (first_element, second_element, temperature, pressure, source_data, article) 
-                   VALUES (?, ?, ?, ?, ?, ?)''',
+                   (first_element, second_element, temperature, pressure, source_data, source_blob, article) 
+                   VALUES (?, ?, ?, ?, ?, ?, ?)''',
                 (experiment.first_element, experiment.second_element, 
                  experiment.temperature, experiment.pressure, 
-                 source_data_json, experiment.article_id)
+                 source_data_json, source_blob, experiment.article_id)
             )
             return cursor.lastrowid
 
     def delete(self, experiment_id: int) -> None:
+        self._forget(Experiment)
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM experiments WHERE id = ?', (experiment_id,))
 
-    def filter_by_elements(self, first_elements: List[str], second_elements: List[str]) -> List[Experiment]:
+    def filter_by_elements(
+        self,
+        first_elements: List[str],
+        second_elements: List[str],
+        lazy: bool = False
+    ) -> List[Experiment]:
+        return self.find_by_element_sets(first_elements, second_elements, lazy=lazy)
+
+    def find_by_element_sets(
+        self,
+        first_elements: Optional[Iterable[str]],
+        second_elements: Optional[Iterable[str]],
+        include_swapped: bool = False,
+        lazy: bool = False
+    ) -> List[Experiment]:
+        rows = self._select_by_element_sets(first_elements, second_elements, include_swapped, lazy)
+        return [self._row_to_experiment(row, lazy) for row in rows]
+
+    def find_with_article_names(
+        self,
+        first_elements: Optional[Iterable[str]],
+        second_elements: Optional[Iterable[str]],
+        include_swapped: bool = False,
+        lazy: bool = True
+    ) -> List[Tuple[Experiment, Optional[str]]]:
+        rows = self._select_by_element_sets(
+            first_elements, second_elements, include_swapped, lazy, with_article_names=True
+        )
+        return [(self._row_to_experiment(row, lazy), row['article_name']) for row in rows]
+
+    def _select_by_element_sets(
+        self,
+        first_elements: Optional[Iterable[str]],
+        second_elements: Optional[Iterable[str]],
+        include_swapped: bool,
+        lazy: bool,
+        with_article_names: bool = False
+    ) -> List[Any]:
+        first = None if first_elements is None else sorted(set(first_elements))
+        second = None if second_elements is None else sorted(set(second_elements))
+        if first == [] or second == []:
+            return []
+
+        def pair(first_column: str, second_column: str) -> Tuple[str, Tuple[str, ...]]:
+            clauses: List[str] = []
+            params: Tuple[str, ...] = ()
+            for column, names in ((first_column, first), (second_column, second)):
+                if names is not None:
+                    clauses.append(f"{column} IN ({','.join([self.db.placeholder] * len(names))})")
+                    params += tuple(names)
+            return ' AND '.join(clauses) or '1 = 1', params
+
+        condition, params = pair('first_element', 'second_element')
+        if include_swapped:
+            swapped, swapped_params = pair('second_element', 'first_element')
+            condition, params = f'({condition}) OR ({swapped})', params + swapped_params
+
+        query = f'SELECT {self._columns(lazy)} FROM experiments WHERE {condition}'
+        if with_article_names:
+            query = f'''SELECT found.*, articles.name AS article_name FROM ({query}) AS found
+                        LEFT JOIN articles ON articles.id = found.article
+                        ORDER BY found.id'''
+        else:
+            query += ' ORDER BY id'
+
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            placeholders_first = ','.join(['?'] * len(first_elements))
-            placeholders_second = ','.join(['?'] * len(second_elements))
-            query = f'''SELECT * FROM experiments 
-                       WHERE first_element IN ({placeholders_first}) 
-                       OR second_element IN ({placeholders_second})'''
-            cursor.execute(query, tuple(first_elements) + tuple(second_elements))
-            rows = cursor.fetchall()
-            return [self._row_to_experiment(row) for row in rows]
+            cursor.execute(query, params)
+            rows: List[Any] = cursor.fetchall()
+            return rows
+
+    def _columns(self, lazy: bool) -> str:
+        return self.METADATA_COLUMNS if lazy else self.COLUMNS
 
-    def _row_to_experiment(self, row) -> Experiment:
+    def _row_to_experiment(self, row, lazy: bool = False) -> Experiment:
         data = self._row_to_dict(row)
+        source_data: Mapping[str, Any]
+        if lazy:
+            experiment_id = data['id']
+            source_data = LazySourceData(lambda: self.get_source_data(experiment_id))
+        else:
+            source_data = self._decode_source(data)
+
         return Experiment(
             id=data['id'],
             first_element=data['first_element'],
             second_element=data['second_element'],
             temperature=data.get('temperature'),
             pressure=data.get('pressure'),
-            source_data=json.loads(data['source_data']) if data.get('source_data') else {},
+            source_data=source_data,
             article_id=data.get('article')
         )
 
+    def _decode_source(self, data: Dict) -> Dict[str, np.ndarray]:
+        if data.get('source_blob'):
+            return columnar.decode(data['source_blob'])
+        if not data.get('source_data'):
+            return {}
+
+        source: Dict[str, Any] = json.loads(data['source_data'])
+        try:
+            return {key: np.asarray(values, dtype=np.float64) for key, values in source.items()}
+        except (TypeError, ValueError):
+            return source
+
 
 class ElementRepository(BaseRepository):
     def get_all(self) -> List[Element]:
@@ -116,44 +274,47 @@ class ModelRepository(BaseRepository):
             return [self._row_to_model(row) for row in rows]
 
     def get_by_id(self, model_id: int) -> Optional[Model]:
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM models WHERE id = ?', (model_id,))
-            row = cursor.fetchone()
-            return self._row_to_model(row) if row else None
+        return self._identity(Model, ('id', model_id), lambda: self._load_one('id', model_id))
 
     def get_by_name(self, name: str) -> Optional[Model]:
+        return self._identity(Model, ('name', name), lambda: self._load_one('name', name))
+
+    def _load_one(self, column: str, value: Any) -> Optional[Model]:
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT * FROM models WHERE name = ?', (name,))
+            cursor.execute(f'SELECT * FROM models WHERE {column} = ?', (value,))
             row = cursor.fetchone()
             return self._row_to_model(row) if row else None
 
     def create(self, model: Model) -> int:
+        self._forget(Model)
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             initial_data_json = json.dumps(model.initial_data)
             cursor.execute(
                 '''INSERT INTO models 
-                   (name, equation, initial_data, calculated_parameter, argument) 
-                   VALUES (?, ?, ?, ?, ?)''',
+                   (name, equation, initial_data, calculated_parameter, argument, derivative_mode) 
+                   VALUES (?, ?, ?, ?, ?, ?)''',
                 (model.name, model.equation, initial_data_json, 
-                 model.calculated_parameter, model.argument)
+                 model.calculated_parameter, model.argument, model.derivative_mode)
             )
             return cursor.lastrowid
 
     def update(self, model: Model) -> None:
+        self._forget(Model)
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             initial_data_json = json.dumps(model.initial_data)
             cursor.execute(
                 '''UPDATE models 
                    SET name = ?, equation = ?, initial_data = ?, 
-                       calculated_parameter = ?, argument = ? 
+                       calculated_parameter = ?, argument = ?, derivative_mode = ? 
                    WHERE id = ?''',
                 (model.name, model.equation, initial_data_json,
-                 model.calculated_parameter, model.argument, model.id)
+                 model.calculated_parameter, model.argument, model.derivative_mode, model.id)
             )
+        if model.id is not None:
+            kernel_store.invalidate(model.id, keep=kernel_store.digest(model))
 
     def _row_to_model(self, row) -> Model:
         data = self._row_to_dict(row)
@@ -163,7 +324,8 @@ class ModelRepository(BaseRepository):
             equation=data['equation'],
             initial_data=json.loads(data['initial_data']) if data.get('initial_data') else {},
             calculated_parameter=data.get('calculated_parameter', ''),
-            argument=data.get('argument', '')
+            argument=data.get('argument', ''),
+            derivative_mode=data.get('derivative_mode') or 'symbolic'
         )
 
 
@@ -176,6 +338,9 @@ class ArticleRepository(BaseRepository):
             return [self._row_to_article(row) for row in rows]
 
     def get_by_id(self, article_id: int) -> Optional[Article]:
+        return self._identity(Article, article_id, lambda: self._load_by_id(article_id))
+
+    def _load_by_id(self, article_id: int) -> Optional[Article]:
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM articles WHERE id = ?', (article_id,))
@@ -183,6 +348,7 @@ class ArticleRepository(BaseRepository):
             return self._row_to_article(row) if row else None
 
     def create(self, article: Article) -> int:
+        self._forget(Article)
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
@@ -192,6 +358,7 @@ class ArticleRepository(BaseRepository):
             return cursor.lastrowid
 
     def delete(self, article_id: int) -> None:
+        self._forget(Article)
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM articles WHERE id = ?', (article_id,))
@@ -215,9 +382,43 @@ class AttemptRepository(BaseRepository):
             result_data_json = json.dumps(attempt.result_data)
             cursor.execute(
                 '''INSERT INTO attempts 
-                   (experiment_id, method_id, init_data, result) 
-                   VALUES (?, ?, ?, ?)''',
-                (attempt.experiment_id, attempt.method_id, 
-                 init_data_json, result_data_json)
+                   (experiment_id, model_id, method_id, init_data, result, cost) 
+                   VALUES (?, ?, ?, ?, ?, ?)''',
+                (attempt.experiment_id, attempt.model_id, attempt.method_id, 
+                 init_data_json, result_data_json, attempt.cost)
+            )
+            return cursor.lastrowid
+
+    def find_by_pair(
+        self,
+        model_id: int,
+        first_element: str,
+        second_element: str
+    ) -> List[Tuple[Attempt, Optional[float]]]:
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''SELECT a.*, e.temperature AS experiment_temperature
+                   FROM attempts a JOIN experiments e ON e.id = a.experiment_id
+                   WHERE a.model_id = ? AND e.first_element = ? AND e.second_element = ?
+                     AND a.cost IS NOT NULL
+                   ORDER BY a.cost''',
+                (model_id, first_element, second_element)
             )
-            return cursor.lastrowid
\ No newline at end of file
+            rows = cursor.fetchall()
+            return [
+                (self._row_to_attempt(row), self._row_to_dict(row)['experiment_temperature'])
+                for row in rows
+            ]
+
+    def _row_to_attempt(self, row) -> Attempt:
+        data = self._row_to_dict(row)
+        return Attempt(
+            id=data['id'],
+            experiment_id=data['experiment_id'],
+            model_id=data.get('model_id'),
+            method_id=data['method_id'],
+            init_data=json.loads(data['init_data']) if data.get('init_data') else {},
+            result_data=json.loads(data['result']) if data.get('result') else {},
+            cost=data.get('cost')
+        )
\ No newline at end of file
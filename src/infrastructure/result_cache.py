@@ -0,0 +1,152 @@
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+import numpy as np
+
+from core.config import settings
+from domain.models import Model
+
+
+def code_version() -> str:
+    digest = hashlib.sha256(np.__version__.encode('utf-8'))
+    for path in sorted((Path(__file__).resolve().parents[1] / 'calculation').glob('*.py')):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+CODE_VERSION = code_version()
+
+
+class ResultCache:
+    def __init__(self, path: Path, max_entries: int = 10000):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(
+        model: Model,
+        data: List[Tuple[float, float]],
+        temperature: float,
+        method_id: int,
+        initial_params: Dict[str, float],
+        options: Dict[str, Any]
+    ) -> str:
+        digest = hashlib.sha256(np.asarray(data, dtype=np.float64).tobytes())
+        key = json.dumps([
+            CODE_VERSION,
+            digest.hexdigest(),
+            float(temperature),
+            ''.join(model.equation.split()),
+            model.calculated_parameter,
+            model.argument,
+            model.derivative_mode,
+            method_id,
+            sorted((k, float(v)) for k, v in initial_params.items()),
+            sorted((k, repr(v)) for k, v in options.items()),
+        ])
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, float], float, Dict[str, Any]]]:
+        if not self.enabled:
+            return None
+
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    'SELECT params, cost, summary FROM results WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None:
+                    conn.execute('UPDATE results SET accessed = ? WHERE key = ?', (time.time(), key))
+        except sqlite3.Error:
+            return None
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(row[0]), row[1], json.loads(row[2])
+
+    def put(self, key: str, params: Dict[str, float], cost: float, summary: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    '''INSERT OR REPLACE INTO results (key, params, cost, summary, created, accessed)
+                       VALUES (?, ?, ?, ?, ?, ?)''',
+                    (key, json.dumps(params), cost, json.dumps(summary), now, now)
+                )
+                conn.execute(
+                    '''DELETE FROM results WHERE key IN (
+                           SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?
+                       )''',
+                    (self.max_entries,)
+                )
+        except sqlite3.Error:
+            pass
+
+    def clear(self) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute('DELETE FROM results')
+        except sqlite3.Error:
+            pass
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        try:
+            with self._connect() as conn:
+                size = conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        except sqlite3.Error:
+            size = 0
+
+        total = self.hits + self.misses
+        return {
+            'size': size,
+            'max_size': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    @contextmanager
+    def _connect(self) -> Generator[sqlite3.Connection, None, None]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=5)
+        try:
+            conn.execute(
+                '''CREATE TABLE IF NOT EXISTS results (
+                       key TEXT PRIMARY KEY,
+                       params TEXT,
+                       cost REAL,
+                       summary TEXT,
+                       created REAL,
+                       accessed REAL
+                   )'''
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_results_accessed ON results (accessed)')
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+
+result_cache = ResultCache(settings.result_cache_path, settings.result_cache_size)
@@ -0,0 +1,188 @@
+import json
+import logging
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from core.config import settings
+from infrastructure import columnar
+from infrastructure.database import DATABASE_ERRORS, DatabaseConnection, db_connection
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = {
+    'elements': '''CREATE TABLE IF NOT EXISTS elements (
+           id INTEGER PRIMARY KEY AUTOINCREMENT,
+           name TEXT,
+           branch TEXT
+       )''',
+    'articles': '''CREATE TABLE IF NOT EXISTS articles (
+           id INTEGER PRIMARY KEY AUTOINCREMENT,
+           name TEXT,
+           author TEXT,
+           year INTEGER,
+           link TEXT
+       )''',
+    'experiments': '''CREATE TABLE IF NOT EXISTS experiments (
+           id INTEGER PRIMARY KEY AUTOINCREMENT,
+           first_element TEXT,
+           second_element TEXT,
+           temperature REAL,
+           pressure REAL,
+           source_data TEXT,
+           source_blob BLOB,
+           article INTEGER
+       )''',
+    'models': '''CREATE TABLE IF NOT EXISTS models (
+           id INTEGER PRIMARY KEY AUTOINCREMENT,
+           name TEXT UNIQUE,
+           equation TEXT,
+           initial_data TEXT,
+           calculated_parameter TEXT,
+           argument TEXT,
+           derivative_mode TEXT DEFAULT 'symbolic'
+       )''',
+    'attempts': '''CREATE TABLE IF NOT EXISTS attempts (
+           id INTEGER PRIMARY KEY AUTOINCREMENT,
+           experiment_id INTEGER,
+           model_id INTEGER,
+           method_id INTEGER,
+           init_data TEXT,
+           result TEXT,
+           cost REAL
+       )''',
+}
+
+MIGRATIONS = [
+    ('models', 'derivative_mode', "TEXT DEFAULT 'symbolic'"),
+    ('experiments', 'source_blob', 'BLOB'),
+]
+
+REBUILDS = [
+    ('attempts', 'model_id'),
+]
+
+INDEXES = [
+    ('idx_attempts_model_experiment', 'attempts', ('model_id', 'experiment_id')),
+    ('idx_experiments_elements', 'experiments', ('first_element', 'second_element')),
+    ('idx_experiments_second_element', 'experiments', ('second_element',)),
+    ('idx_elements_name', 'elements', ('name',)),
+]
+
+MYSQL_INDEX_PREFIX = 191
+
+
+def create_schema(db: DatabaseConnection = db_connection) -> None:
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        for statement in SCHEMA.values():
+            cursor.execute(_dialect(statement))
+    migrate(db)
+
+
+def migrate(db: DatabaseConnection = db_connection) -> None:
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+
+        for table, column in REBUILDS:
+            columns = _columns(cursor, table)
+            if columns and column not in columns:
+                cursor.execute(f'ALTER TABLE {table} RENAME TO {table}_legacy')
+            if not columns or column not in columns:
+                cursor.execute(_dialect(SCHEMA[table]))
+
+        for table, column, definition in MIGRATIONS:
+            if column not in _columns(cursor, table):
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+        for name, table, index_columns in INDEXES:
+            _create_index(cursor, name, table, index_columns)
+
+        backfill_source_blobs(cursor, db.placeholder)
+
+
+def backfill_source_blobs(cursor: Any, placeholder: str = '?') -> int:
+    cursor.execute(
+        'SELECT id, source_data FROM experiments WHERE source_blob IS NULL AND source_data IS NOT NULL'
+    )
+    converted = 0
+    for row in cursor.fetchall():
+        try:
+            blob = columnar.encode(json.loads(row['source_data']))
+        except (TypeError, ValueError):
+            continue
+        cursor.execute(
+            f'UPDATE experiments SET source_blob = {placeholder} WHERE id = {placeholder}',
+            (blob, row['id'])
+        )
+        converted += 1
+    return converted
+
+
+def drop_source_json(db: DatabaseConnection = db_connection) -> int:
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            'SELECT id, source_data, source_blob FROM experiments '
+            'WHERE source_blob IS NOT NULL AND source_data IS NOT NULL'
+        )
+        verified = []
+        for row in cursor.fetchall():
+            if _same_columns(json.loads(row['source_data']), columnar.decode(bytes(row['source_blob']))):
+                verified.append((row['id'],))
+
+        cursor.executemany(
+            f'UPDATE experiments SET source_data = NULL WHERE id = {db.placeholder}', verified
+        )
+        return len(verified)
+
+
+def _same_columns(source: Dict[str, Any], decoded: Dict[str, np.ndarray]) -> bool:
+    if list(source) != list(decoded):
+        return False
+    try:
+        return all(
+            np.array_equal(np.asarray(values, dtype=np.float64), decoded[key], equal_nan=True)
+            for key, values in source.items()
+        )
+    except (TypeError, ValueError):
+        return False
+
+
+def _create_index(cursor: Any, name: str, table: str, columns: Sequence[str]) -> None:
+    if settings.db_type != 'mysql':
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({", ".join(columns)})')
+        return
+
+    cursor.execute(f"SHOW INDEX FROM {table} WHERE Key_name = '{name}'")
+    if cursor.fetchall():
+        return
+
+    cursor.execute(f'SHOW COLUMNS FROM {table}')
+    types = {row['Field']: row['Type'].lower() for row in cursor.fetchall()}
+    parts = [
+        f'{column}({MYSQL_INDEX_PREFIX})' if 'text' in types.get(column, '') else column
+        for column in columns
+    ]
+    try:
+        cursor.execute(f'CREATE INDEX {name} ON {table} ({", ".join(parts)})')
+    except DATABASE_ERRORS:
+        logger.exception('Failed to create index %s on %s', name, table)
+
+
+def _dialect(statement: str) -> str:
+    if settings.db_type == 'mysql':
+        return statement.replace('AUTOINCREMENT', 'AUTO_INCREMENT')
+    return statement
+
+
+def _columns(cursor: Any, table: str) -> List[str]:
+    if settings.db_type == 'mysql':
+        cursor.execute(f"SHOW TABLES LIKE '{table}'")
+        if not cursor.fetchall():
+            return []
+        cursor.execute(f'SHOW COLUMNS FROM {table}')
+        return [row['Field'] for row in cursor.fetchall()]
+
+    cursor.execute(f'PRAGMA table_info({table})')
+    return [row[1] for row in cursor.fetchall()]
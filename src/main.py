@@ -1,17 +1,26 @@
 import sys
+
 from PyQt5.QtWidgets import QApplication
 
+from infrastructure.database import db_connection
+from infrastructure.repositories import ModelRepository
+from infrastructure.schema import migrate
+from services.calculation_service import CalculationService
 from ui.main_window import MainWindow
 
 
 def main():
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
+    migrate()
+    CalculationService().precompile_models(ModelRepository().get_all())
     
     window = MainWindow()
     window.show()
     
-    return app.exec_()
+    code = app.exec_()
+    db_connection.close_all()
+    return code
 
 
 if __name__ == '__main__':
@@ -1,43 +1,199 @@
+import logging
+import math
+import os
 import random
-from typing import Dict, List, Tuple
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import suppress
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
+
+from calculation.budget import STOP_COMPLETED
+from calculation.cache import ExpressionCache
+from calculation.curve import adaptive_curve
 from calculation.function import MathFunction
-from calculation.optimizer import get_optimizer
-from domain.models import Experiment, Model
-from infrastructure.repositories import ExperimentRepository
+from calculation.instrumentation import FitSummary, IterationCallback, OptimizationResult
+from calculation.optimizer import get_optimizer, is_deterministic
+from calculation.population import PopulationEngine
+from calculation.uncertainty import (
+    UncertaintyResult,
+    asymptotic_uncertainty,
+    bootstrap_refits,
+    summarize_bootstrap,
+)
+from core.config import settings
+from domain.models import Attempt, Experiment, Model
+from infrastructure.database import DATABASE_ERRORS
+from infrastructure.kernel_store import kernel_store
+from infrastructure.repositories import AttemptRepository, ExperimentRepository
+from infrastructure.result_cache import result_cache
+
+logger = logging.getLogger(__name__)
+
+expression_cache = ExpressionCache(settings.expression_cache_size)
+
+MULTI_START_STRATEGIES = ('serial', 'process', 'population')
 
 
 class CalculationService:
     def __init__(self):
         self.experiment_repo = ExperimentRepository()
+        self.attempt_repo = AttemptRepository()
+        self.multi_start_stats: Dict[str, Any] = {}
+        self._curves: OrderedDict[tuple, Tuple[np.ndarray, np.ndarray]] = OrderedDict()
 
     def prepare_data(self, experiment: Experiment, model: Model) -> List[Tuple[float, float]]:
-        data = []
         source = experiment.source_data
         
-        arg_values = source.get(model.argument, [])
-        param_values = source.get(model.calculated_parameter, [])
+        arg_values = np.asarray(source.get(model.argument, []), dtype=np.float64)
+        param_values = np.asarray(source.get(model.calculated_parameter, []), dtype=np.float64)
+        size = min(len(arg_values), len(param_values))
         
-        for i in range(min(len(arg_values), len(param_values))):
-            data.append((float(arg_values[i]), float(param_values[i])))
-        
-        return data
+        return list(zip(arg_values[:size].tolist(), param_values[:size].tolist()))
 
     def create_function(self, model: Model) -> MathFunction:
-        return MathFunction(
+        return expression_cache.get_function(
             model.equation,
             model.calculated_parameter,
-            model.argument
+            model.argument,
+            derivative_mode=model.derivative_mode,
+            on_create=lambda func: self._load_kernels(model, func)
         )
 
+    def precompile_models(self, models: List[Model]) -> int:
+        compiled = 0
+
+        for model in models:
+            try:
+                func = self.create_function(model)
+                func.precompile(func.parameters)
+            except Exception:
+                continue
+
+            self.save_kernels(model, func)
+            compiled += 1
+
+        return compiled
+
+    def save_kernels(self, model: Model, func: MathFunction) -> None:
+        if model.id is None or not func.has_unsaved_kernels:
+            return
+
+        with suppress(OSError):
+            kernel_store.save(model, func.export_kernels())
+
+    def _load_kernels(self, model: Model, func: MathFunction) -> None:
+        payload = kernel_store.load(model)
+        if payload:
+            func.load_kernels(payload)
+
     def optimize(
         self,
         experiment_id: int,
         model: Model,
         method_id: int,
         initial_params: Dict[str, float],
+        callback: Optional[IterationCallback] = None,
+        profile: bool = False,
+        record: bool = True,
+        use_cache: bool = True,
         **kwargs
-    ) -> Tuple[Dict[str, float], float]:
+    ) -> OptimizationResult:
+        func, data, temperature = self.load_problem(experiment_id, model)
+
+        key = None
+        cached = None
+        if (use_cache and callback is None and not profile and 'cancel_token' not in kwargs
+                and is_deterministic(method_id, kwargs)):
+            key = result_cache.make_key(model, data, temperature, method_id, initial_params, kwargs)
+            cached = result_cache.get(key)
+
+        if cached is not None:
+            params, cost, summary = cached
+            result = OptimizationResult(params, cost, FitSummary.from_dict({**summary, 'cached': True}))
+        else:
+            result = self._solve(
+                func, data, temperature, method_id, initial_params, kwargs,
+                callback=callback, profile=profile
+            )
+            self.save_kernels(model, func)
+            if (key is not None and result.summary is not None
+                    and result.summary.stop_reason == STOP_COMPLETED and math.isfinite(result.cost)):
+                result_cache.put(key, result.params, result.cost, result.summary.to_dict())
+
+        if record:
+            self.record_attempt(experiment_id, model, method_id, initial_params, result.params, result.cost)
+        return result
+
+    def record_attempt(
+        self,
+        experiment_id: int,
+        model: Model,
+        method_id: int,
+        init_data: Dict[str, Any],
+        params: Dict[str, float],
+        cost: float
+    ) -> Optional[int]:
+        if model.id is None or not math.isfinite(cost):
+            return None
+
+        try:
+            return self.attempt_repo.create(Attempt(
+                experiment_id=experiment_id,
+                model_id=model.id,
+                method_id=method_id,
+                init_data=init_data,
+                result_data=params,
+                cost=cost,
+            ))
+        except DATABASE_ERRORS:
+            logger.exception('Failed to record attempt for experiment %s', experiment_id)
+            return None
+
+    def suggest_initial_params(self, experiment_id: int, model: Model) -> Optional[Dict[str, float]]:
+        experiment = self.experiment_repo.get_by_id(experiment_id)
+        if experiment is None or model.id is None:
+            return None
+
+        try:
+            candidates = self.attempt_repo.find_by_pair(
+                model.id, experiment.first_element, experiment.second_element
+            )
+        except DATABASE_ERRORS:
+            logger.exception('Failed to load previous attempts for experiment %s', experiment_id)
+            return None
+
+        parameters = self.create_function(model).parameters
+        window = settings.warm_start_temperature_window
+        best = None
+
+        for attempt, temperature in candidates:
+            if not all(name in attempt.result_data for name in parameters):
+                continue
+
+            if attempt.experiment_id == experiment_id:
+                distance = -1.0
+            elif experiment.temperature is None or temperature is None:
+                continue
+            else:
+                distance = abs(temperature - experiment.temperature)
+                if distance > window:
+                    continue
+
+            if best is None or distance < best[0]:
+                best = (distance, attempt)
+
+        if best is None:
+            return None
+        return {name: float(best[1].result_data[name]) for name in parameters}
+
+    def load_problem(
+        self,
+        experiment_id: int,
+        model: Model
+    ) -> Tuple[MathFunction, List[Tuple[float, float]], float]:
         experiment = self.experiment_repo.get_by_id(experiment_id)
         if not experiment:
             raise ValueError(f'Experiment {experiment_id} not found')
@@ -45,9 +201,7 @@ class CalculationService:
         func = self.create_function(model)
         data = self.prepare_data(experiment, model)
         temperature = experiment.temperature or 298.15
-
-        optimizer = get_optimizer(method_id, func, data, temperature)
-        return optimizer.optimize(initial_params, **kwargs)
+        return func, data, temperature
 
     def multi_start_optimize(
         self,
@@ -57,51 +211,328 @@ class CalculationService:
         mins: Dict[str, float],
         maxs: Dict[str, float],
         count: int,
+        seed: Optional[int] = None,
+        strategy: str = 'serial',
+        workers: Optional[int] = None,
         **kwargs
     ) -> List[Dict[str, float]]:
         results = []
+        best = None
         
-        for _ in range(count):
-            random_params = {
-                key: random.uniform(mins[key], maxs[key]) 
-                for key in mins.keys()
-            }
-            
+        for index, optimized, cost in self.iter_multi_start(
+            experiment_id,
+            model,
+            method_id,
+            mins,
+            maxs,
+            count,
+            seed=seed,
+            strategy=strategy,
+            workers=workers,
+            **kwargs
+        ):
+            if all(mins[k] <= optimized[k] <= maxs[k] for k in optimized if k in mins):
+                results.append((index, optimized))
+                if best is None or cost < best[1]:
+                    best = (optimized, cost)
+        
+        if best is not None:
+            init_data = {'mins': mins, 'maxs': maxs, 'count': count}
+            self.record_attempt(experiment_id, model, method_id, init_data, *best)
+        
+        results.sort(key=lambda item: item[0])
+        return [optimized for _, optimized in results]
+
+    def iter_multi_start(
+        self,
+        experiment_id: int,
+        model: Model,
+        method_id: int,
+        mins: Dict[str, float],
+        maxs: Dict[str, float],
+        count: int,
+        seed: Optional[int] = None,
+        strategy: str = 'serial',
+        workers: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[Tuple[int, Dict[str, float], float]]:
+        if strategy not in MULTI_START_STRATEGIES:
+            raise ValueError(f'Unsupported multi-start strategy: {strategy}')
+
+        func, data, temperature = self.load_problem(experiment_id, model)
+        starts = self.generate_starts(mins, maxs, count, seed)
+        kwargs = {'bounds': {key: (mins[key], maxs[key]) for key in mins}, **kwargs}
+        began = time.perf_counter()
+        finished = 0
+
+        if strategy == 'serial':
+            runs = self._run_serial(func, data, temperature, method_id, starts, kwargs)
+        elif strategy == 'process':
+            func.precompile(list(mins))
+            self.save_kernels(model, func)
+            runs = self._run_processes(model, data, temperature, method_id, starts, workers, kwargs)
+        else:
+            runs = self._run_population(func, data, temperature, method_id, starts, kwargs)
+
+        for index, optimized, cost in runs:
+            finished += 1
+            yield index, optimized, cost
+
+        elapsed = time.perf_counter() - began
+        self.multi_start_stats = {
+            'strategy': strategy,
+            'starts': len(starts),
+            'finished': finished,
+            'elapsed': elapsed,
+            'starts_per_second': len(starts) / elapsed if elapsed > 0 else float('inf'),
+        }
+        self.save_kernels(model, func)
+
+    def _run_serial(
+        self,
+        func: MathFunction,
+        data: List[Tuple[float, float]],
+        temperature: float,
+        method_id: int,
+        starts: List[Dict[str, float]],
+        options: Dict[str, Any]
+    ) -> Iterator[Tuple[int, Dict[str, float], float]]:
+        cancel_token = options.get('cancel_token')
+        for index, start in enumerate(starts):
+            if cancel_token is not None and cancel_token.cancelled:
+                break
             try:
-                optimized, _ = self.optimize(
-                    experiment_id, 
-                    model, 
-                    method_id, 
-                    random_params,
-                    **kwargs
-                )
-                
-                if all(mins[k] <= optimized[k] <= maxs[k] for k in optimized if k in mins):
-                    results.append(optimized)
+                optimized, cost = self._solve(func, data, temperature, method_id, start, options)
             except Exception:
                 continue
-        
-        return results
+            yield index, optimized, cost
+
+    def _run_processes(
+        self,
+        model: Model,
+        data: List[Tuple[float, float]],
+        temperature: float,
+        method_id: int,
+        starts: List[Dict[str, float]],
+        workers: Optional[int],
+        options: Dict[str, Any]
+    ) -> Iterator[Tuple[int, Dict[str, float], float]]:
+        max_workers = workers or settings.multistart_workers or os.cpu_count() or 1
+        options = dict(options)
+        cancel_token = options.pop('cancel_token', None)
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {
+                executor.submit(_run_start, model, method_id, data, temperature, start, options): index
+                for index, start in enumerate(starts)
+            }
+            for future in as_completed(futures):
+                if cancel_token is not None and cancel_token.cancelled:
+                    break
+                try:
+                    optimized, cost = future.result()
+                except Exception:
+                    continue
+                yield futures[future], optimized, cost
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run_population(
+        self,
+        func: MathFunction,
+        data: List[Tuple[float, float]],
+        temperature: float,
+        method_id: int,
+        starts: List[Dict[str, float]],
+        options: Dict[str, Any]
+    ) -> Iterator[Tuple[int, Dict[str, float], float]]:
+        engine = PopulationEngine(get_optimizer(method_id, func, data, temperature))
+        if not engine.supports(engine.method):
+            raise ValueError(f'Method {method_id} has no population implementation')
+
+        cancel_token = options.get('cancel_token')
+        if cancel_token is not None and cancel_token.cancelled:
+            return
+
+        options = {'time_limit': settings.fit_time_limit or None, **options}
+        result = engine.optimize(starts, **options)
+        for index, (optimized, cost) in enumerate(zip(result.params, result.costs)):
+            yield index, optimized, cost
+
+    def estimate_uncertainty(
+        self,
+        experiment_id: int,
+        model: Model,
+        method_id: int,
+        params: Dict[str, float],
+        bootstrap: int = 0,
+        confidence: float = 0.95,
+        seed: Optional[int] = None,
+        strategy: str = 'process',
+        workers: Optional[int] = None,
+        **kwargs
+    ) -> UncertaintyResult:
+        if strategy not in ('serial', 'process'):
+            raise ValueError(f'Unsupported bootstrap strategy: {strategy}')
+
+        began = time.perf_counter()
+        func, data, temperature = self.load_problem(experiment_id, model)
+        result = asymptotic_uncertainty(get_optimizer(method_id, func, data, temperature), params, confidence)
+
+        if bootstrap > 0:
+            if seed is None:
+                seed = random.getrandbits(63)
+            bootstrap_began = time.perf_counter()
+
+            if strategy == 'serial':
+                samples, first_error = bootstrap_refits(
+                    func, data, temperature, method_id, params, seed, range(bootstrap), kwargs
+                )
+            else:
+                func.precompile(list(params))
+                self.save_kernels(model, func)
+                samples, first_error = self._run_bootstrap(
+                    model, data, temperature, method_id, params, seed, bootstrap, workers, kwargs
+                )
+            summarize_bootstrap(result, samples, time.perf_counter() - bootstrap_began, first_error)
+
+        result.elapsed = time.perf_counter() - began
+        return result
+
+    def _run_bootstrap(
+        self,
+        model: Model,
+        data: List[Tuple[float, float]],
+        temperature: float,
+        method_id: int,
+        params: Dict[str, float],
+        seed: int,
+        count: int,
+        workers: Optional[int],
+        options: Dict[str, Any]
+    ) -> Tuple[np.ndarray, Optional[str]]:
+        max_workers = workers or settings.multistart_workers or os.cpu_count() or 1
+        chunks = [chunk for chunk in np.array_split(np.arange(count), max_workers * 4) if chunk.size]
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            parts = list(executor.map(
+                _run_bootstrap_chunk,
+                *zip(*[
+                    (model, method_id, data, temperature, params, seed, chunk.tolist(), options)
+                    for chunk in chunks
+                ])
+            ))
+        errors = [error for _, error in parts if error is not None]
+        return np.vstack([samples for samples, _ in parts]), errors[0] if errors else None
+
+    @staticmethod
+    def generate_starts(
+        mins: Dict[str, float],
+        maxs: Dict[str, float],
+        count: int,
+        seed: Optional[int] = None
+    ) -> List[Dict[str, float]]:
+        rng = random.Random(seed)
+        return [
+            {key: rng.uniform(mins[key], maxs[key]) for key in mins.keys()}
+            for _ in range(count)
+        ]
+
+    def _solve(
+        self,
+        func: MathFunction,
+        data: List[Tuple[float, float]],
+        temperature: float,
+        method_id: int,
+        initial_params: Dict[str, float],
+        options: Dict[str, Any],
+        callback: Optional[IterationCallback] = None,
+        profile: bool = False
+    ) -> OptimizationResult:
+        optimizer = get_optimizer(
+            method_id, func, data, temperature, callback=callback, profile=profile
+        )
+        options = {'time_limit': settings.fit_time_limit or None, **options}
+        return optimizer.run(initial_params, **options)
 
     def generate_plot_data(
         self,
         experiment: Experiment,
         model: Model,
-        optimized_params: Dict[str, float]
+        optimized_params: Dict[str, float],
+        budget: Optional[int] = None
     ) -> Tuple[List[float], List[float], List[float], List[float]]:
-        func = self.create_function(model)
         data = self.prepare_data(experiment, model)
         
         if not data:
             return [], [], [], []
         
-        start, end = data[0][0], data[-1][0]
-        x_model = [0] + [start + 0.005 * n for n in range(int((end - start) / 0.005) + 1) if start + 0.005 * n < end] + [1]
-        
-        params = {**optimized_params, 'temp': experiment.temperature or 298.15}
-        y_model = [func.evaluate({**params, 'x': x}) for x in x_model]
+        start = min(0.0, data[0][0])
+        end = max(1.0, data[-1][0])
+        x_model, y_model = self.model_curve(
+            model, optimized_params, experiment.temperature or 298.15,
+            start, end, budget or settings.plot_point_budget
+        )
         
         x_exp = [0] + [d[0] for d in data] + [1]
         y_exp = [0] + [d[1] for d in data] + [1]
         
-        return x_model, y_model, x_exp, y_exp
\ No newline at end of file
+        return x_model.tolist(), y_model.tolist(), x_exp, y_exp
+
+    def model_curve(
+        self,
+        model: Model,
+        params: Dict[str, float],
+        temperature: float,
+        start: float,
+        end: float,
+        budget: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        key = (
+            expression_cache.make_key(model.equation, model.calculated_parameter, model.argument, 'numpy'),
+            tuple(sorted(params.items())),
+            temperature,
+            start,
+            end,
+            budget,
+        )
+        curve = self._curves.get(key)
+        if curve is not None:
+            self._curves.move_to_end(key)
+            return curve
+
+        func = self.create_function(model)
+        point = {**params, 'temp': temperature}
+        curve = adaptive_curve(lambda x: func.evaluate_array({**point, 'x': x}), start, end, budget)
+
+        self._curves[key] = curve
+        while len(self._curves) > max(settings.plot_cache_size, 0):
+            self._curves.popitem(last=False)
+        return curve
+
+
+def _run_bootstrap_chunk(
+    model: Model,
+    method_id: int,
+    data: List[Tuple[float, float]],
+    temperature: float,
+    params: Dict[str, float],
+    seed: int,
+    indices: List[int],
+    options: Dict[str, Any]
+) -> Tuple[np.ndarray, Optional[str]]:
+    func = CalculationService().create_function(model)
+    return bootstrap_refits(func, data, temperature, method_id, params, seed, indices, options)
+
+
+def _run_start(
+    model: Model,
+    method_id: int,
+    data: List[Tuple[float, float]],
+    temperature: float,
+    initial_params: Dict[str, float],
+    options: Dict[str, Any]
+) -> OptimizationResult:
+    service = CalculationService()
+    func = service.create_function(model)
+    return service._solve(func, data, temperature, method_id, initial_params, options)
@@ -1,10 +1,16 @@
 from typing import Optional
 
-from PyQt5.QtWidgets import QDialog, QMessageBox
 from PyQt5 import uic
+from PyQt5.QtWidgets import QDialog, QMessageBox
 
 from domain.models import Model
 from infrastructure.repositories import ModelRepository
+from services.calculation_service import CalculationService
+
+DERIVATIVE_MODE_NAMES = {
+    'symbolic': 'Символьные (SymPy)',
+    'autodiff': 'Автоматическое дифференцирование',
+}
 
 
 class ModelDialog(QDialog):
@@ -14,6 +20,9 @@ class ModelDialog(QDialog):
         self.model_repo = ModelRepository()
         self.model = model
         
+        for mode, title in DERIVATIVE_MODE_NAMES.items():
+            self.ui.derivativeModeCombo.addItem(title, mode)
+        
         if model:
             self._load_model_data()
         
@@ -28,6 +37,9 @@ class ModelDialog(QDialog):
         self.ui.equationEdit.setText(self.model.equation)
         self.ui.calculatedParamEdit.setText(self.model.calculated_parameter)
         self.ui.argumentEdit.setText(self.model.argument)
+        self.ui.derivativeModeCombo.setCurrentIndex(
+            self.ui.derivativeModeCombo.findData(self.model.derivative_mode)
+        )
         
         initial_data_str = '\n'.join([f'{k}: {v}' for k, v in self.model.initial_data.items()])
         self.ui.initialDataEdit.setPlainText(initial_data_str)
@@ -38,6 +50,7 @@ class ModelDialog(QDialog):
             equation = self.ui.equationEdit.text().strip()
             calc_param = self.ui.calculatedParamEdit.text().strip()
             argument = self.ui.argumentEdit.text().strip()
+            derivative_mode = self.ui.derivativeModeCombo.currentData()
             
             if not all([name, equation, calc_param, argument]):
                 QMessageBox.warning(self, 'Ошибка', 'Заполните все обязательные поля')
@@ -51,17 +64,22 @@ class ModelDialog(QDialog):
                 self.model.calculated_parameter = calc_param
                 self.model.argument = argument
                 self.model.initial_data = initial_data
+                self.model.derivative_mode = derivative_mode
                 self.model_repo.update(self.model)
+                saved = self.model
             else:
                 new_model = Model(
                     name=name,
                     equation=equation,
                     calculated_parameter=calc_param,
                     argument=argument,
-                    initial_data=initial_data
+                    initial_data=initial_data,
+                    derivative_mode=derivative_mode
                 )
-                self.model_repo.create(new_model)
+                new_model.id = self.model_repo.create(new_model)
+                saved = new_model
             
+            CalculationService().precompile_models([saved])
             QMessageBox.information(self, 'Успех', 'Модель успешно сохранена')
             self.accept()
             
@@ -1,17 +1,25 @@
+from typing import Optional
+
+from PyQt5 import uic
 from PyQt5.QtWidgets import (
-    QMainWindow, QTableWidgetItem, QMessageBox, 
-    QMenu, QAbstractItemView, QHeaderView
+    QAbstractItemView,
+    QHeaderView,
+    QMainWindow,
+    QMenu,
+    QMessageBox,
+    QTableWidgetItem,
 )
-from PyQt5 import uic
 
 from infrastructure.repositories import (
-    ExperimentRepository, ElementRepository,
-    ModelRepository, ArticleRepository
+    ArticleRepository,
+    ElementRepository,
+    ExperimentRepository,
+    ModelRepository,
 )
 from services.search_service import SearchService
+from ui.dialogs.experiment_info_dialog import ExperimentInfoDialog
 from ui.dialogs.import_dialog import ImportDialog
 from ui.dialogs.model_dialog import ModelDialog
-from ui.dialogs.experiment_info_dialog import ExperimentInfoDialog
 from ui.widgets.calculation_widget import CalculationWidget
 
 
@@ -96,16 +104,17 @@ class MainWindow(QMainWindow):
         first_elements = self.search_service.get_elements_by_filter(first_filter)
         second_elements = self.search_service.get_elements_by_filter(second_filter)
         
-        experiments = self.experiment_repo.get_all()
+        experiments = self.experiment_repo.find_with_article_names(
+            None if first_filter == 'Any' else first_elements,
+            None if second_filter == 'Any' else second_elements
+        )
         
-        for exp in experiments:
-            if (exp.first_element in first_elements or first_filter == 'Any') and \
-               (exp.second_element in second_elements or second_filter == 'Any'):
-                self._add_experiment_row(exp)
+        for exp, article_name in experiments:
+            self._add_experiment_row(exp, article_name)
         
         self._resize_table_columns(self.ui.experimentsTab)
 
-    def _add_experiment_row(self, exp):
+    def _add_experiment_row(self, exp, article_name: Optional[str] = None):
         row = self.ui.experimentsTab.rowCount()
         self.ui.experimentsTab.insertRow(row)
         
@@ -121,9 +130,7 @@ class MainWindow(QMainWindow):
         self.ui.experimentsTab.setItem(row, 4, QTableWidgetItem(temp))
         self.ui.experimentsTab.setItem(row, 5, QTableWidgetItem(pressure))
         
-        article = self.article_repo.get_by_id(exp.article_id)
-        article_name = article.name if article else '-'
-        self.ui.experimentsTab.setItem(row, 6, QTableWidgetItem(article_name))
+        self.ui.experimentsTab.setItem(row, 6, QTableWidgetItem(article_name or '-'))
 
     def _load_elements(self):
         self.ui.elementsTab.setRowCount(0)
@@ -1,22 +1,26 @@
 import json
 from typing import Dict
 
-from PyQt5.QtWidgets import QWidget, QMessageBox
-from PyQt5 import uic
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from PyQt5 import uic
+from PyQt5.QtWidgets import QMessageBox, QWidget
 
 from domain.models import Model
+from infrastructure.identity_map import identity_scope
 from infrastructure.repositories import ExperimentRepository, ModelRepository
 from services.calculation_service import CalculationService
 
-
 METHOD_NAMES = {
     0: 'Имитация отжига',
     1: 'Гаусса-Зейделя',
     2: 'Хукка-Дживса',
     3: 'Антиградиент',
-    4: 'Ньютона'
+    4: 'Ньютона',
+    5: 'Левенберга-Марквардта',
+    6: 'L-BFGS',
+    7: 'Нелдера-Мида',
+    8: 'Параллельный отжиг'
 }
 
 
@@ -64,22 +68,30 @@ class CalculationWidget(QWidget):
             model_name = self.ui.modelComboBox.currentText()
             method_id = self.ui.methodComboBox.currentIndex()
             
-            model = self.model_repo.get_by_name(model_name)
-            if not model:
-                QMessageBox.warning(self, 'Ошибка', 'Модель не найдена')
-                return
-            
-            if self.ui.multiStartCheckBox.isChecked():
-                self._run_multistart(experiment_id, model, method_id)
-            else:
-                self._run_single(experiment_id, model, method_id)
+            with identity_scope():
+                model = self.model_repo.get_by_name(model_name)
+                if not model:
+                    QMessageBox.warning(self, 'Ошибка', 'Модель не найдена')
+                    return
+                
+                if self.ui.multiStartCheckBox.isChecked():
+                    self._run_multistart(experiment_id, model, method_id)
+                else:
+                    self._run_single(experiment_id, model, method_id)
                 
         except Exception as e:
             QMessageBox.critical(self, 'Ошибка', f'Ошибка при расчете: {str(e)}')
 
     def _run_single(self, experiment_id: int, model: Model, method_id: int):
         initial_params_str = self.ui.initialParamsEdit.text()
-        initial_params = self._parse_params(initial_params_str)
+        if initial_params_str.strip():
+            initial_params = self._parse_params(initial_params_str)
+        else:
+            initial_params = (
+                self.calc_service.suggest_initial_params(experiment_id, model)
+                or dict(model.initial_data)
+            )
+            self.ui.initialParamsEdit.setText(json.dumps(initial_params))
         
         result, cost = self.calc_service.optimize(
             experiment_id, 
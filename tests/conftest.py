@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from calculation.function import MathFunction  # noqa: E402
+from core.config import settings  # noqa: E402
+from infrastructure.database import db_connection  # noqa: E402
+
+MARGULES = '8.31 * temp * x * (1 - x) * ((1 - x) * a12 + a21 * x)'
+TEMPERATURE = 298.15
+
+
+@pytest.fixture
+def parameters():
+    return ('a12', 'a21')
+
+
+@pytest.fixture
+def point():
+    return {'x': 0.35, 'temp': TEMPERATURE, 'a12': 1.3, 'a21': 0.7}
+
+
+@pytest.fixture
+def grid():
+    return {
+        'x': np.linspace(0.05, 0.95, 9),
+        'temp': TEMPERATURE,
+        'a12': np.array([[0.5], [1.3], [2.4]]),
+        'a21': np.array([[0.2], [0.7], [1.1]]),
+    }
+
+
+@pytest.fixture
+def function_pair():
+    def make(equation, first, second):
+        return (
+            MathFunction(equation, 'GEJ', 'x2', **first),
+            MathFunction(equation, 'GEJ', 'x2', **second),
+        )
+    return make
+
+
+@pytest.fixture
+def margules():
+    return MathFunction(MARGULES, 'GEJ', 'x2')
+
+
+@pytest.fixture
+def margules_data():
+    x = np.linspace(0.1, 0.9, 9)
+    y = 8.31 * TEMPERATURE * x * (1 - x) * ((1 - x) * 0.4 + 0.6 * x)
+    return list(zip(x.tolist(), y.tolist())), TEMPERATURE
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'db_type', 'sqlite')
+    monkeypatch.setattr(settings, 'sqlite_path', tmp_path / 'test.db')
+    yield db_connection
+    db_connection.close_all()
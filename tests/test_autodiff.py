@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+import sympy as sp
+
+from calculation import autodiff
+from calculation.function import MathFunction
+
+EQUATIONS = [
+    '8.31 * temp * x * (1 - x) * ((1 - x) * a12 + a21 * x)',
+    'x ** a12 * (1 + a21) ** (x * a12) + temp ** (a21 / 10)',
+    'sin(a12 * x) + cos(a21) * tanh(a12 * x) + sinh(a21 * x) - cosh(a12) + atan(a21 * x) + tan(0.3 * a12)',
+    'exp(-a12 * x / temp) * log(1 + a21 * x ** 2) + sqrt(a12 + a21) / x',
+]
+MODES = ({'derivative_mode': 'autodiff'}, {'derivative_mode': 'symbolic'})
+
+
+@pytest.mark.parametrize('equation', EQUATIONS)
+def test_point_derivatives_match_symbolic(equation, function_pair, parameters, point):
+    dual, symbolic = function_pair(equation, *MODES)
+
+    for var in parameters:
+        assert dual.derivative(var, point) == pytest.approx(symbolic.derivative(var, point), rel=1e-10)
+        for other in parameters:
+            assert dual.second_derivative(var, other, point) == pytest.approx(
+                symbolic.second_derivative(var, other, point), rel=1e-10, abs=1e-12
+            )
+
+
+@pytest.mark.parametrize('equation', EQUATIONS)
+def test_batched_derivatives_match_symbolic(equation, function_pair, parameters, grid):
+    dual, symbolic = function_pair(equation, *MODES)
+
+    for var in parameters:
+        np.testing.assert_allclose(
+            dual.derivative_array(var, grid), symbolic.derivative_array(var, grid), rtol=1e-10
+        )
+        np.testing.assert_allclose(
+            dual.second_derivative_array(var, 'a21', grid),
+            symbolic.second_derivative_array(var, 'a21', grid),
+            rtol=1e-10, atol=1e-12
+        )
+
+    for expected, actual in zip(
+        symbolic.value_gradient_hessian(parameters, grid),
+        dual.value_gradient_hessian(parameters, grid)
+    ):
+        assert actual.shape == expected.shape
+        np.testing.assert_allclose(actual, expected, rtol=1e-10, atol=1e-12)
+
+
+def test_point_shapes_are_scalar(function_pair, parameters, point):
+    dual, _ = function_pair(EQUATIONS[0], *MODES)
+    value, gradient, hessian = dual.value_gradient_hessian(parameters, point)
+
+    assert value.shape == ()
+    assert gradient.shape == (2,)
+    assert hessian.shape == (2, 2)
+
+
+def test_constant_expression_has_zero_derivatives(parameters, point):
+    value, gradient, hessian = autodiff.evaluate(sp.sympify('2 * x + 1'), parameters, point, order=2)
+
+    assert float(value) == pytest.approx(1.7)
+    assert not gradient.any()
+    assert hessian is not None and not hessian.any()
+
+
+def test_unsupported_node_raises(point):
+    dual = MathFunction('Abs(a12 - 2) * x', 'GEJ', 'x2', derivative_mode='autodiff')
+
+    with pytest.raises(ValueError, match='Abs'):
+        dual.derivative('a12', point)
@@ -0,0 +1,58 @@
+import logging
+
+import pytest
+
+from domain.models import Experiment, Model
+from infrastructure.kernel_store import kernel_store
+from infrastructure.repositories import ExperimentRepository, ModelRepository
+from infrastructure.result_cache import ResultCache
+from infrastructure.schema import create_schema
+from services import calculation_service
+from services.calculation_service import CalculationService
+
+LEVENBERG_MARQUARDT = 5
+
+
+@pytest.fixture
+def problem(database, margules, margules_data, tmp_path, monkeypatch):
+    monkeypatch.setattr(calculation_service, 'result_cache', ResultCache(tmp_path / 'results.db'))
+    monkeypatch.setattr(kernel_store, 'directory', tmp_path / 'kernels')
+    create_schema()
+
+    data, temperature = margules_data
+    x, y = zip(*data)
+    experiment_id = ExperimentRepository().create(Experiment(
+        first_element='Methanol',
+        second_element='Water',
+        temperature=temperature,
+        source_data={'x2': list(x), 'GEJ': list(y)},
+    ))
+    model = Model(name='margules', equation=margules.expression, initial_data={'a12': 1.0, 'a21': 1.0},
+                  calculated_parameter='GEJ', argument='x2')
+    model.id = ModelRepository().create(model)
+    return experiment_id, model
+
+
+def test_cached_fits_are_recorded(problem):
+    experiment_id, model = problem
+    service = CalculationService()
+
+    first = service.optimize(experiment_id, model, LEVENBERG_MARQUARDT, dict(model.initial_data))
+    second = service.optimize(experiment_id, model, LEVENBERG_MARQUARDT, dict(model.initial_data))
+
+    assert not first.summary.cached and second.summary.cached
+    assert second.params == pytest.approx({'a12': 0.4, 'a21': 0.6})
+    attempts = service.attempt_repo.find_by_pair(model.id, 'Methanol', 'Water')
+    assert len(attempts) == 2
+
+
+def test_database_errors_are_logged(problem, database, caplog):
+    experiment_id, model = problem
+    with database.get_connection() as conn:
+        conn.execute('DROP TABLE attempts')
+
+    with caplog.at_level(logging.ERROR, logger='services.calculation_service'):
+        recorded = CalculationService().record_attempt(experiment_id, model, 5, {}, {'a12': 0.4}, 1.0)
+
+    assert recorded is None
+    assert 'Failed to record attempt' in caplog.text
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from infrastructure import columnar
+
+
+def test_round_trip_keeps_names_order_and_values():
+    columns = {'x2': [0.0, 0.25, 1.0], 'GEJ': [np.nan, -1e-300, 1e300], 'пусто': [], 'y1': range(3)}
+
+    decoded = columnar.decode(columnar.encode(columns))
+
+    assert list(decoded) == list(columns)
+    for name, values in columns.items():
+        assert decoded[name].dtype == np.float64
+        np.testing.assert_array_equal(decoded[name], np.asarray(list(values), dtype=np.float64))
+
+
+def test_columns_are_aligned_for_zero_copy_reads():
+    blob = columnar.encode({'a': [1.0], 'bcd': [2.0, 3.0]})
+
+    assert len(blob) % 8 == 0
+    np.testing.assert_array_equal(columnar.decode(memoryview(blob))['bcd'], [2.0, 3.0])
+
+
+def test_foreign_blob_is_rejected():
+    with pytest.raises(ValueError):
+        columnar.decode(b'JSON' + bytes(16))
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from calculation.function import MathFunction
+
+MARGULES = '8.31 * temp * x * (1 - x) * ((1 - x) * a12 + a21 * x)'
+NONLINEAR = 'exp(-a12 * x / temp) * log(1 + a21 * x ** 2) + a12 ** 2 * x'
+
+EQUATIONS = [MARGULES, NONLINEAR]
+BACKENDS = ({'backend': 'numpy'}, {'backend': 'sympy'})
+
+
+@pytest.mark.parametrize('equation', EQUATIONS)
+def test_point_values_match_sympy(equation, function_pair, parameters, point):
+    fast, exact = function_pair(equation, *BACKENDS)
+
+    assert fast.evaluate(point) == pytest.approx(exact.evaluate(point), rel=1e-12)
+    for var in parameters:
+        assert fast.derivative(var, point) == pytest.approx(exact.derivative(var, point), rel=1e-12)
+        for other in parameters:
+            assert fast.second_derivative(var, other, point) == pytest.approx(
+                exact.second_derivative(var, other, point), rel=1e-12, abs=1e-12
+            )
+
+
+@pytest.mark.parametrize('equation', EQUATIONS)
+def test_array_values_match_sympy(equation, function_pair, parameters, grid):
+    fast, exact = function_pair(equation, *BACKENDS)
+
+    np.testing.assert_allclose(fast.evaluate_array(grid), exact.evaluate_array(grid), rtol=1e-12)
+    for var in parameters:
+        np.testing.assert_allclose(
+            fast.derivative_array(var, grid), exact.derivative_array(var, grid), rtol=1e-12
+        )
+        for other in parameters:
+            np.testing.assert_allclose(
+                fast.second_derivative_array(var, other, grid),
+                exact.second_derivative_array(var, other, grid),
+                rtol=1e-12, atol=1e-12
+            )
+
+
+@pytest.mark.parametrize('equation', EQUATIONS)
+def test_value_gradient_hessian_matches_sympy(equation, function_pair, parameters, grid):
+    fast, exact = function_pair(equation, *BACKENDS)
+
+    for expected, actual in zip(
+        exact.value_gradient_hessian(parameters, grid),
+        fast.value_gradient_hessian(parameters, grid)
+    ):
+        assert actual.shape == expected.shape
+        np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=1e-12)
+
+    value, gradient = fast.value_and_gradient(parameters, grid)
+    np.testing.assert_allclose(value, exact.evaluate_array(grid), rtol=1e-12)
+    np.testing.assert_allclose(gradient[1], exact.derivative_array('a21', grid), rtol=1e-12)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        MathFunction(MARGULES, 'GEJ', 'x2', backend='fortran')
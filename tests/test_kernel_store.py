@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from calculation.function import MathFunction
+from domain.models import Model
+from infrastructure.kernel_store import PROJECT_ROOT, KernelStore
+
+MODEL = Model(id=7, name='margules', equation='8.31 * temp * x * (1 - x) * (a12 + a21 * x)',
+              calculated_parameter='GEJ', argument='x2')
+POINT = {'x': 0.35, 'temp': 298.15, 'a12': 1.3, 'a21': 0.7}
+
+
+def exported_kernels():
+    func = MathFunction(MODEL.equation, MODEL.calculated_parameter, MODEL.argument)
+    func.precompile(func.parameters)
+    return func.export_kernels()
+
+
+def test_relative_directory_is_anchored_to_project():
+    assert KernelStore('.cache/kernels').directory == PROJECT_ROOT / '.cache' / 'kernels'
+
+
+def test_saved_kernels_load_into_a_new_function(tmp_path):
+    store = KernelStore(tmp_path)
+    store.save(MODEL, exported_kernels())
+
+    func = MathFunction(MODEL.equation, MODEL.calculated_parameter, MODEL.argument)
+    func.load_kernels(store.load(MODEL))
+    assert not func.has_unsaved_kernels
+    assert func.derivative('a21', POINT) == pytest.approx(8.31 * 298.15 * 0.35 * 0.65 * 0.35)
+
+
+def test_tampered_or_foreign_files_are_ignored(tmp_path):
+    store = KernelStore(tmp_path)
+    store.save(MODEL, exported_kernels())
+    path = next(tmp_path.glob('7-*.json'))
+
+    payload = json.loads(path.read_text(encoding='utf-8'))
+    payload['kernels'][0][1] = 'def kernel(*args):\n    raise SystemExit\n'
+    path.write_text(json.dumps(payload), encoding='utf-8')
+    assert store.load(MODEL) is None
+
+    path.write_text(json.dumps(exported_kernels()), encoding='utf-8')
+    assert store.load(MODEL) is None
@@ -0,0 +1,177 @@
+import pytest
+
+from calculation.budget import (
+    STOP_CANCELLED,
+    STOP_COMPLETED,
+    STOP_DEADLINE,
+    STOP_MAX_EVALUATIONS,
+    CancellationToken,
+)
+from calculation.function import MathFunction
+from calculation.optimizer import (
+    LBFGS,
+    OPTIMIZATION_METHODS,
+    GaussSeidel,
+    HookeJeeves,
+    LevenbergMarquardt,
+    NelderMead,
+    ParallelTempering,
+)
+
+
+@pytest.mark.parametrize('method', [GaussSeidel, HookeJeeves])
+def test_integer_bounds_give_float_params(method, margules, margules_data):
+    optimizer = method(margules, *margules_data)
+    result = optimizer.run({'a12': 5.0, 'a21': 0.0}, bounds={'a12': (1, 2), 'a21': (0, 1)})
+
+    assert result.params['a12'] == 1.0
+    assert all(type(value) is float for value in result.params.values())
+    assert all(type(value) is float for value in optimizer.project({'a12': 5, 'a21': -1}).values())
+
+
+def test_levenberg_marquardt_converges_in_few_evaluations(margules, margules_data):
+    result = LevenbergMarquardt(margules, *margules_data).run({'a12': 1.0, 'a21': 1.0})
+
+    assert result.params == pytest.approx({'a12': 0.4, 'a21': 0.6}, rel=1e-8)
+    assert result.cost < 1e-12
+    assert result.summary.evaluate_calls <= 10
+
+
+def test_levenberg_marquardt_handles_singular_jacobian(margules_data):
+    redundant = MathFunction('8.31 * temp * x * (1 - x) * (a12 + a21)', 'GEJ', 'x2')
+    single = MathFunction('8.31 * temp * x * (1 - x) * c', 'GEJ', 'x2')
+
+    result = LevenbergMarquardt(redundant, *margules_data).run({'a12': 1.0, 'a21': 1.0})
+    reference = LevenbergMarquardt(single, *margules_data).run({'c': 1.0})
+
+    assert result.params['a12'] + result.params['a21'] == pytest.approx(reference.params['c'], rel=1e-8)
+    assert result.cost == pytest.approx(reference.cost, rel=1e-8)
+
+
+def test_levenberg_marquardt_stops_on_active_bound(margules, margules_data):
+    result = LevenbergMarquardt(margules, *margules_data).run(
+        {'a12': 1.0, 'a21': 1.0}, bounds={'a12': (0.5, 2.0)}
+    )
+
+    assert result.params['a12'] == 0.5
+    assert result.params['a21'] < 0.6
+
+
+def test_lbfgs_converges_and_stops_at_optimum(margules, margules_data):
+    result = LBFGS(margules, *margules_data).run({'a12': 1.0, 'a21': 1.0})
+    assert result.params == pytest.approx({'a12': 0.4, 'a21': 0.6}, rel=1e-8)
+
+    warm = LBFGS(margules, *margules_data).run(result.params)
+    assert warm.summary.iterations == 0
+    assert warm.summary.evaluate_calls == 1
+
+
+def test_nelder_mead_converges_without_derivatives(margules, margules_data):
+    result = NelderMead(margules, *margules_data).run({'a12': 1.0, 'a21': 1.0})
+
+    assert result.params == pytest.approx({'a12': 0.4, 'a21': 0.6}, rel=1e-5)
+    assert result.summary.derivative_calls == 0
+
+
+def test_new_methods_are_registered():
+    assert OPTIMIZATION_METHODS[6] is LBFGS
+    assert OPTIMIZATION_METHODS[7] is NelderMead
+
+
+def test_parallel_tempering_is_reproducible_with_seed(margules, margules_data):
+    start = {'a12': 1.0, 'a21': 1.0}
+    first = ParallelTempering(margules, *margules_data).run(start, seed=1)
+    second = ParallelTempering(margules, *margules_data, seed=1).run(start)
+
+    assert first.params == second.params
+    assert first.summary.evaluate_calls == second.summary.evaluate_calls
+    assert first.cost < 1e-6 * LevenbergMarquardt(margules, *margules_data).objective_sum(start)
+    assert first.params == pytest.approx({'a12': 0.4, 'a21': 0.6}, rel=1e-2)
+
+
+def test_parallel_tempering_stays_inside_bounds(margules, margules_data):
+    bounds = {'a12': (0.5, 2.0), 'a21': (0.0, 1.0)}
+    result = ParallelTempering(margules, *margules_data).run({'a12': 1.0, 'a21': 1.0}, bounds=bounds, seed=3)
+
+    for name, (low, high) in bounds.items():
+        assert low <= result.params[name] <= high
+    assert result.params['a12'] == pytest.approx(0.5, abs=1e-2)
+
+
+def test_memo_skips_repeated_probes_without_changing_the_result(margules, margules_data):
+    start = {'a12': 1.0, 'a21': 1.0}
+    cached = HookeJeeves(margules, *margules_data).run(start)
+    plain = HookeJeeves(margules, *margules_data, memo_size=0).run(start)
+
+    assert cached.params == plain.params
+    assert cached.summary.memo_hits > 0
+    assert cached.summary.evaluate_calls + cached.summary.memo_hits == plain.summary.evaluate_calls
+
+
+def test_memo_is_bounded(margules, margules_data):
+    optimizer = GaussSeidel(margules, *margules_data, memo_size=2)
+    for value in (0.1, 0.2, 0.3, 0.1):
+        optimizer.objective_sum({'a12': value, 'a21': 0.5})
+
+    assert optimizer.memo_stats()['size'] == 2
+    assert optimizer.memo_hits == 0 and optimizer.memo_misses == 4
+
+
+@pytest.mark.parametrize('method_id', sorted(OPTIMIZATION_METHODS))
+@pytest.mark.parametrize('limit', [1, 5, 40])
+def test_max_evaluations_is_never_exceeded(method_id, limit, margules, margules_data):
+    optimizer = OPTIMIZATION_METHODS[method_id](margules, *margules_data)
+    result = optimizer.run({'a12': 1.0, 'a21': 1.0}, max_evaluations=limit)
+
+    assert result.summary.evaluate_calls <= limit
+    assert result.summary.stop_reason in (STOP_COMPLETED, STOP_MAX_EVALUATIONS)
+
+
+def test_budget_stop_keeps_best_params(margules, margules_data, monkeypatch):
+    initial = NelderMead(margules, *margules_data).objective_sum({'a12': 1.0, 'a21': 1.0})
+    calls = []
+    evaluate_array = margules.evaluate_array
+    monkeypatch.setattr(margules, 'evaluate_array', lambda params: calls.append(1) or evaluate_array(params))
+
+    optimizer = NelderMead(margules, *margules_data)
+    result = optimizer.run({'a12': 1.0, 'a21': 1.0}, max_evaluations=20)
+
+    assert result.summary.stop_reason == STOP_MAX_EVALUATIONS
+    assert len(calls) == result.summary.evaluate_calls <= 20
+    assert result.cost < initial
+    assert optimizer.objective_sum(result.params) == pytest.approx(result.cost)
+
+
+def test_cancelled_token_stops_before_evaluating(margules, margules_data):
+    token = CancellationToken()
+    token.cancel()
+    result = LBFGS(margules, *margules_data).run({'a12': 1.0, 'a21': 1.0}, cancel_token=token)
+
+    assert result.summary.stop_reason == STOP_CANCELLED
+    assert result.params == {'a12': 1.0, 'a21': 1.0}
+    assert result.summary.evaluate_calls == 1
+
+
+def test_deadline_stops_the_run(margules, margules_data):
+    result = ParallelTempering(margules, *margules_data).run(
+        {'a12': 1.0, 'a21': 1.0}, time_limit=1e-9, seed=1
+    )
+
+    assert result.summary.stop_reason == STOP_DEADLINE
+
+
+def test_fused_and_per_component_derivatives_are_counted_alike(margules, margules_data):
+    params = {'a12': 1.0, 'a21': 1.0}
+    pairs = [('a12', 'a12'), ('a12', 'a21'), ('a21', 'a21')]
+    fused = NelderMead(margules, *margules_data)
+    split = NelderMead(margules, *margules_data)
+
+    fused.gradient(params)
+    for key in params:
+        split.gradient_component(params, key)
+    assert fused.counts['derivative'] == split.counts['derivative'] == 2
+
+    fused.hessian(params)
+    for var1, var2 in pairs:
+        split.hessian_component(params, var1, var2)
+    assert fused.counts['second_derivative'] == split.counts['second_derivative'] == 3
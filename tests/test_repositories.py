@@ -0,0 +1,89 @@
+import pytest
+
+from domain.models import Article, Experiment
+from infrastructure.identity_map import current_identity_map, identity_scope
+from infrastructure.repositories import ArticleRepository, ExperimentRepository
+from infrastructure.schema import create_schema
+
+PAIRS = [('Methanol', 'Water'), ('Water', 'Methanol'), ('Ethanol', 'Water'), ('Methanol', 'Hexane')]
+
+
+@pytest.fixture
+def experiments(database):
+    create_schema()
+    repo = ExperimentRepository()
+    for first, second in PAIRS:
+        repo.create(Experiment(first_element=first, second_element=second, temperature=298.15,
+                               source_data={'x2': [0.5], 'GEJ': [1.0]}))
+    return repo
+
+
+def pairs(found):
+    return [(experiment.first_element, experiment.second_element) for experiment in found]
+
+
+def test_both_element_sets_must_match(experiments):
+    found = experiments.find_by_element_sets(['Methanol', 'Ethanol'], ['Water'])
+
+    assert pairs(found) == [('Methanol', 'Water'), ('Ethanol', 'Water')]
+    assert pairs(experiments.filter_by_elements(['Methanol', 'Ethanol'], ['Water'])) == pairs(found)
+
+
+def test_swapped_pairs_are_optional(experiments):
+    found = experiments.find_by_element_sets(['Methanol'], ['Water'], include_swapped=True)
+
+    assert pairs(found) == [('Methanol', 'Water'), ('Water', 'Methanol')]
+
+
+def test_none_matches_any_element_and_empty_matches_nothing(experiments):
+    assert pairs(experiments.find_by_element_sets(None, ['Water'])) == [('Methanol', 'Water'), ('Ethanol', 'Water')]
+    assert pairs(experiments.find_by_element_sets(None, None)) == PAIRS
+    assert experiments.find_by_element_sets([], None) == []
+
+
+def test_lazy_results_load_data_on_access(experiments):
+    found = experiments.find_by_element_sets(['Ethanol'], None, lazy=True)
+
+    assert not found[0].source_data.loaded
+    assert list(found[0].source_data['GEJ']) == [1.0]
+
+
+@pytest.mark.usefixtures('experiments')
+def test_element_query_uses_index(database):
+    with database.get_connection() as conn:
+        plan = conn.execute(
+            'EXPLAIN QUERY PLAN SELECT id FROM experiments WHERE first_element IN (?) AND second_element IN (?)',
+            ('Methanol', 'Water')
+        ).fetchall()
+
+    assert 'idx_experiments_elements' in ' '.join(row[-1] for row in plan)
+
+
+def test_article_names_are_joined(experiments):
+    article_id = ArticleRepository().create(Article(name='VLE of alcohols'))
+    experiments.create(Experiment(first_element='Propanol', second_element='Water', article_id=article_id))
+
+    found = experiments.find_with_article_names(['Propanol', 'Ethanol'], ['Water'])
+
+    assert [(experiment.first_element, name) for experiment, name in found] == [
+        ('Ethanol', None), ('Propanol', 'VLE of alcohols')
+    ]
+    assert not found[0][0].source_data.loaded
+
+
+def test_identity_scope_returns_loaded_objects(experiments):
+    articles = ArticleRepository()
+    article_id = articles.create(Article(name='VLE of alcohols'))
+
+    assert articles.get_by_id(article_id) is not articles.get_by_id(article_id)
+    with identity_scope() as identity_map:
+        first = articles.get_by_id(article_id)
+        with identity_scope() as nested:
+            assert nested is identity_map
+            assert articles.get_by_id(article_id) is first
+        assert experiments.get_by_id(1) is experiments.get_by_id(1)
+        assert identity_map.misses == 2 and identity_map.hits == 2
+
+        articles.create(Article(name='Another'))
+        assert articles.get_by_id(article_id) is not first
+    assert current_identity_map() is None
@@ -0,0 +1,43 @@
+import pytest
+
+from calculation.optimizer import is_deterministic
+from domain.models import Model
+from infrastructure import result_cache as result_cache_module
+from infrastructure.result_cache import ResultCache
+
+MODEL = Model(id=1, name='margules', equation='a12 * x', calculated_parameter='GEJ', argument='x2')
+DATA = [(0.1, 1.0), (0.5, 2.0)]
+
+
+def make_key(method_id=5, options=None):
+    return ResultCache.make_key(MODEL, DATA, 298.15, method_id, {'a12': 1.0}, options or {})
+
+
+def test_round_trip_and_eviction(tmp_path):
+    cache = ResultCache(tmp_path / 'results.db', max_entries=1)
+    first, second = make_key(5), make_key(6)
+
+    cache.put(first, {'a12': 2.0}, 0.5, {'method': 'LevenbergMarquardt'})
+    assert cache.get(first) == ({'a12': 2.0}, 0.5, {'method': 'LevenbergMarquardt'})
+
+    cache.put(second, {'a12': 3.0}, 0.25, {})
+    assert cache.get(first) is None
+    assert cache.get(second) is not None
+
+
+def test_key_depends_on_code_version(monkeypatch):
+    key = make_key()
+    monkeypatch.setattr(result_cache_module, 'CODE_VERSION', 'changed')
+
+    assert make_key() != key
+
+
+@pytest.mark.parametrize('method_id, options, expected', [
+    (0, {}, False),
+    (0, {'seed': 1}, False),
+    (8, {}, False),
+    (8, {'seed': 1}, True),
+    (5, {}, True),
+])
+def test_stochastic_methods_are_cached_only_when_seeded(method_id, options, expected):
+    assert is_deterministic(method_id, options) is expected
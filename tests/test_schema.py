@@ -0,0 +1,114 @@
+import json
+import sqlite3
+
+import numpy as np
+import pymysql
+import pytest
+
+from core.config import settings
+from infrastructure import columnar, schema
+from infrastructure.schema import create_schema, drop_source_json, migrate
+
+SOURCE = {'x2': [0.0, 0.0960, 0.2041, 1.0], 'GEJ': [0.0, 163.7, 291.05, -1e-3]}
+
+
+def make_legacy(path):
+    conn = sqlite3.connect(str(path))
+    conn.execute(
+        '''CREATE TABLE experiments (
+               id INTEGER PRIMARY KEY AUTOINCREMENT,
+               first_element TEXT,
+               second_element TEXT,
+               temperature REAL,
+               pressure REAL,
+               source_data TEXT,
+               article INTEGER
+           )'''
+    )
+    conn.execute(
+        'INSERT INTO experiments (first_element, second_element, temperature, source_data) VALUES (?, ?, ?, ?)',
+        ('Methanol', 'Water', 298.15, json.dumps(SOURCE))
+    )
+    conn.execute(
+        'INSERT INTO experiments (first_element, second_element, temperature, source_data) VALUES (?, ?, ?, ?)',
+        ('Ethanol', 'Water', 298.15, 'not json')
+    )
+    conn.commit()
+    conn.close()
+
+
+def read_experiments(path):
+    conn = sqlite3.connect(str(path))
+    rows = conn.execute('SELECT id, source_data, source_blob FROM experiments ORDER BY id').fetchall()
+    conn.close()
+    return rows
+
+
+@pytest.mark.usefixtures('database')
+def test_migration_backfills_blob_and_keeps_json(tmp_path):
+    make_legacy(tmp_path / 'test.db')
+    create_schema()
+    migrate()
+
+    (_, text, blob), (_, broken, broken_blob) = read_experiments(tmp_path / 'test.db')
+    assert json.loads(text) == SOURCE
+    decoded = columnar.decode(blob)
+    assert list(decoded) == list(SOURCE)
+    for key, values in SOURCE.items():
+        np.testing.assert_array_equal(decoded[key], np.asarray(values, dtype=np.float64))
+    assert broken == 'not json' and broken_blob is None
+
+
+@pytest.mark.usefixtures('database')
+def test_drop_source_json_clears_only_verified_rows(tmp_path):
+    make_legacy(tmp_path / 'test.db')
+    create_schema()
+
+    assert drop_source_json() == 1
+    migrate()
+    (_, text, blob), (_, broken, _) = read_experiments(tmp_path / 'test.db')
+    assert text is None and blob is not None
+    assert broken == 'not json'
+
+
+class MySQLCursor:
+    def __init__(self, existing=(), error=None):
+        self.existing = existing
+        self.error = error
+        self.statements = []
+        self.result = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        if statement.startswith('SHOW INDEX'):
+            self.result = [{'Key_name': name} for name in self.existing if f"'{name}'" in statement]
+        elif statement.startswith('SHOW COLUMNS'):
+            self.result = [{'Field': 'id', 'Type': 'int'}, {'Field': 'first_element', 'Type': 'text'},
+                           {'Field': 'second_element', 'Type': 'TEXT'}]
+        elif self.error is not None:
+            raise self.error
+
+    def fetchall(self):
+        return self.result
+
+
+def test_mysql_indexes_use_prefix_on_text_columns(monkeypatch):
+    monkeypatch.setattr(settings, 'db_type', 'mysql')
+    cursor = MySQLCursor()
+
+    schema._create_index(cursor, 'idx_experiments_elements', 'experiments', ('first_element', 'second_element'))
+
+    assert cursor.statements[-1] == (
+        'CREATE INDEX idx_experiments_elements ON experiments (first_element(191), second_element(191))'
+    )
+
+
+def test_mysql_index_is_created_once_and_failures_are_logged(monkeypatch, caplog):
+    monkeypatch.setattr(settings, 'db_type', 'mysql')
+    existing = MySQLCursor(existing=['idx_elements_name'])
+    schema._create_index(existing, 'idx_elements_name', 'elements', ('name',))
+    assert not any(statement.startswith('CREATE') for statement in existing.statements)
+
+    failing = MySQLCursor(error=pymysql.MySQLError('too long'))
+    schema._create_index(failing, 'idx_elements_name', 'elements', ('name',))
+    assert 'Failed to create index idx_elements_name' in caplog.text